@@ -0,0 +1,69 @@
+"""Benchmark cold start time of each wwfs command line mode.
+
+Every run starts a fresh interpreter, so timings include imports, lexicon
+loading and the turn itself. Continue modes replay the save file written
+by the mode before them::
+
+    $ python benchmarks/bench_startup.py --repeat 5 --rack thecatw
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA = os.path.join(ROOT, 'wwfs', 'data')
+RUN = ("import sys; from wwfs.__main__ import run_wwfs; "
+       "sys.argv[0] = 'wwfs'; run_wwfs()")
+
+
+def cli_modes(rack):
+    """Return (name, interpreter arguments) of each mode, in run order."""
+    board = os.path.join(DATA, 'board.csv')
+    tiles = os.path.join(DATA, 'tiles.csv')
+    return [
+        ("import", ["-c", "import wwfs.__main__"]),
+        ("--help", ["-c", RUN, "--help"]),
+        ("player1 new", ["-c", RUN, "-p", "-s", "p1new.pkl", board, tiles,
+                         rack]),
+        ("player2 continue", ["-c", RUN, "-o", "-l", "p1new.pkl", "-s",
+                              "p2.pkl", "-c", "0,0", "-d", "0", "when"]),
+        ("player1 continue", ["-c", RUN, "-p", "-l", "p2.pkl", "-s",
+                              "p1.pkl", rack]),
+    ]
+
+
+def time_run(args, cwd):
+    """Return the wall time of one fresh interpreter run."""
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    start = time.perf_counter()
+    subprocess.run([sys.executable] + args, cwd=cwd, env=env, check=True,
+                   stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-n', '--repeat', type=int, default=5,
+                        help="Runs of each mode.")
+    parser.add_argument('-r', '--rack', default="thecatw",
+                        help="Rack letters for player1 turns.")
+    args = parser.parse_args()
+
+    timings = {name: [] for name, _args in cli_modes(args.rack)}
+    with tempfile.TemporaryDirectory() as cwd:
+        for _i in range(args.repeat):
+            for name, mode_args in cli_modes(args.rack):
+                timings[name].append(time_run(mode_args, cwd))
+
+    print("{:<18} {:>8} {:>8} {:>8}".format("mode", "min", "median", "max"))
+    for name, times in timings.items():
+        print("{:<18} {:>7.3f}s {:>7.3f}s {:>7.3f}s".format(
+              name, min(times), statistics.median(times), max(times)))
+
+
+if __name__ == '__main__':
+    main()
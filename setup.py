@@ -27,7 +27,7 @@ setup(
         'Topic :: Word Games',
         'Programming Language :: Python :: 3',
     ],
-    install_requires=['sphinx', 'pytest'
+    install_requires=['sphinx', 'pytest', 'numpy'
                       ],
     entry_points={
         'console_scripts': ['wwfs=wwfs.__main__:run_wwfs'],
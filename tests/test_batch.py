@@ -0,0 +1,70 @@
+import json
+import pytest
+from os import path as p
+from wwfs.batch import solve_position, solve_positions
+from wwfs.pool import SolverPool
+
+_wwfs = p.dirname(p.abspath(__file__))
+test_data = p.join(_wwfs, '..', 'wwfs', 'data')
+BOARD = p.join(test_data, "board.csv")
+TILES = p.join(test_data, "tiles.csv")
+
+
+@pytest.fixture
+def mypositions():
+    return [json.dumps({"id": 1, "rack": "aeirst0",
+                        "words": [["THECAT", [5, 3], 0],
+                                  ["WHEN", [4, 6], 1]]}),
+            json.dumps({"id": 2, "rack": "thecat"}),
+            "not json",
+            json.dumps({"id": 4})]
+
+
+def test_solve_position(mypositions):
+    """Solve a position into its k best moves, best first."""
+    observed = json.loads(solve_position(mypositions[0], BOARD, TILES, k=3))
+    assert observed["id"] == 1
+    assert len(observed["moves"]) == 3
+    scores = [move["score"] for move in observed["moves"]]
+    assert scores == sorted(scores, reverse=True)
+    move = json.loads(solve_position(mypositions[1], BOARD, TILES))["moves"][0]
+    x, y = move["coord"]
+    covered = [(x, y + i) if move["direction"] == 0 else (x + i, y)
+               for i in range(len(move["word"]))]
+    assert (5, 5) in covered
+
+
+def test_solve_position_error(mypositions):
+    """Positions that cannot be read return their error."""
+    assert "error" in json.loads(solve_position(mypositions[2], BOARD, TILES))
+    observed = json.loads(solve_position(mypositions[3], BOARD, TILES))
+    assert observed["id"] == 4
+    assert observed["error"].startswith("KeyError")
+
+
+@pytest.mark.parametrize("line, error", [
+    ("[1, 2]", "TypeError"),
+    ("null", "TypeError"),
+    (json.dumps({"id": 5, "rack": "cat", "board": "missing.csv"}),
+     "FileNotFoundError"),
+    (json.dumps({"id": 6, "rack": "cat", "tilebag": "missing.csv"}),
+     "FileNotFoundError")
+])
+def test_solve_position_bad_input(line, error):
+    """Lines that are not positions, or name missing files, return errors."""
+    observed = json.loads(solve_position(line, BOARD, TILES))
+    assert observed["error"].startswith(error)
+    with SolverPool(2) as mypool:
+        observed = [json.loads(x) for x in solve_positions(
+                    [line, json.dumps({"id": 7, "rack": "thecat"})], mypool,
+                    BOARD, TILES)]
+    assert observed[0]["error"].startswith(error)
+    assert observed[1]["id"] == 7 and observed[1]["moves"]
+
+
+def test_solve_positions(mypositions):
+    """Results stream back in input order, blank lines are skipped."""
+    with SolverPool(2) as mypool:
+        observed = [json.loads(x) for x in solve_positions(
+                    mypositions + [""], mypool, BOARD, TILES)]
+    assert [x["id"] for x in observed] == [1, 2, None, 4]
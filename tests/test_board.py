@@ -1,6 +1,5 @@
 import pytest
 from os import path as p
-from pandas import DataFrame
 from wwfs.board import Board, Square
 from wwfs.word import Word
 
@@ -19,8 +18,10 @@ def myboard():
 def test_board_instansiate(myboard):
     """Can instansiate square object."""
 
-    assert isinstance(myboard.grid, DataFrame)
-    assert isinstance(myboard.tile_grid, DataFrame)
+    assert isinstance(myboard.grid, list)
+    assert len(myboard.grid) == 11
+    assert len(myboard.tile_grid) == myboard.width == 11
+    assert myboard.arrays.letters.shape == (11, 11)
 
 
 @pytest.mark.parametrize("word, x, y, direction, expected", [
@@ -41,6 +42,44 @@ def test_get_n_squares_from_xy_d(myboard, word, x, y, direction, expected):
     assert squares == expected
 
 
+def test_board_arrays(myboard):
+    """Squares are views of the board arrays."""
+    square = myboard.tile_grid[1][1]
+    assert square.word_value_multiplier == 2
+    assert myboard.arrays.word_multipliers[1, 1] == 2
+    square.tile_letter = "Q"
+    square.free = False
+    assert myboard.arrays.letters[1, 1] == ord("Q")
+    assert myboard.arrays.occupied.sum() == 1
+    assert myboard.get_square_xy(Word("Q"), 1, 1, 0)[0].tile_letter == "Q"
+
+
+def test_anchors(myboard):
+    """Free squares next to tiles are tracked as anchors."""
+    assert myboard.anchors() == [(5, 5)]
+    myboard.play_word(Word("AT", coord=(5, 5), direction=0))
+    assert myboard.anchors() == [(4, 5), (4, 6), (5, 4), (5, 7), (6, 5),
+                                 (6, 6)]
+    assert myboard.line_anchors(5, 0) == [4, 7]
+    assert myboard.line_anchors(5, 1) == [4, 6]
+    myboard.play_word(Word("TO", coord=(5, 6), direction=1))
+    assert (6, 6) not in myboard.anchors()
+    assert myboard.line_anchors(6, 0) == [5, 7]
+
+
+def test_cross_checks(myboard):
+    """Playing a word updates cross checks of the squares around it."""
+    assert myboard.is_playable("Q", (4, 5), 0)
+    assert myboard.cross_score((4, 5), 0) is None
+    myboard.play_word(Word("AT", coord=(5, 5), direction=0))
+    assert myboard.is_playable("T", (4, 5), 0)
+    assert not myboard.is_playable("Q", (4, 5), 0)
+    assert myboard.is_playable("Q", (4, 5), 1)
+    assert myboard.is_playable("C", (5, 4), 1)
+    assert not myboard.is_playable("Q", (5, 4), 1)
+    assert myboard.cross_score((4, 5), 0) == 0
+
+
 @pytest.mark.parametrize("word, expected", [
     (Word("CAT", coord=(1, 1), direction=0), [("C", 1, 1, True),
                                               ("A", 1, 2, True),
@@ -0,0 +1,190 @@
+import pickle
+import pytest
+from os import path as p
+from wwfs.board import Board
+from wwfs.gaddag import (Gaddag, Move, MoveGenerator, build_move, find_moves,
+                         gaddag_paths, move_key)
+from wwfs.lexicon import Lexicon
+from wwfs.tiles import TileBag
+from wwfs.word import Word
+
+_wwfs = p.dirname(p.abspath(__file__))
+test_data = p.join(_wwfs, '..', 'wwfs', 'data')
+
+WORDS = ["AT", "CAT", "CATS", "SCAT", "ACT", "TA", "AS", "TAS"]
+
+
+@pytest.fixture
+def mylexicon():
+    return Lexicon(WORDS)
+
+
+@pytest.fixture
+def mygaddag():
+    return Gaddag(WORDS)
+
+
+@pytest.fixture
+def mytilebag():
+    return TileBag(p.join(test_data, 'tiles.csv'))
+
+
+@pytest.fixture
+def myboard(mylexicon, mytilebag):
+    return Board(p.join(test_data, 'board.csv'), mytilebag, lexicon=mylexicon)
+
+
+def test_gaddag_paths():
+    """Words are stored once per split point."""
+    assert gaddag_paths("CAT") == ["TAC", "C+AT", "AC+T"]
+
+
+def test_gaddag_instansiate(mygaddag):
+    """Can instansiate a Gaddag, holding every path of every word."""
+    assert isinstance(mygaddag, Gaddag)
+    assert "AC+T" in mygaddag
+    assert "TAC" in mygaddag
+    assert "CAT" not in mygaddag
+
+
+def test_anchors_empty_board(myboard, mygaddag):
+    """First move is anchored on the center square."""
+    generator = MoveGenerator(myboard, "CAT", mygaddag)
+    assert generator.anchors() == [(5, 5)]
+
+
+def test_anchors(myboard, mygaddag):
+    """Anchors are the free squares next to played tiles."""
+    myboard.play_word(Word("AT", coord=(5, 5), direction=0))
+    generator = MoveGenerator(myboard, "S", mygaddag)
+    assert generator.anchors() == [(4, 5), (4, 6), (5, 4), (5, 7), (6, 5),
+                                   (6, 6)]
+
+
+def test_cross_check(myboard, mygaddag):
+    """Cross words restrict the letters playable on a square."""
+    myboard.play_word(Word("AT", coord=(5, 5), direction=0))
+    generator = MoveGenerator(myboard, "S", mygaddag)
+    assert generator.cross_check((4, 5), 0) == ({"T"}, "", "A")
+    assert generator.cross_check((4, 5), 1)[0] is None
+
+
+@pytest.mark.parametrize("rack, expected", [
+    ("S", {("AS", (5, 5), 1), ("CATS", (5, 4), 0), ("SCAT", (5, 3), 0)}),
+    ("0", {("AS", (5, 5), 1), ("AT", (4, 6), 1), ("AT", (5, 5), 1),
+           ("CATS", (5, 4), 0), ("SCAT", (5, 3), 0), ("TA", (4, 5), 1),
+           ("TA", (5, 6), 1)}),
+    ("AS", {("AS", (4, 3), 1), ("AS", (4, 6), 0), ("AS", (4, 7), 1),
+            ("AS", (5, 5), 1), ("AS", (6, 6), 0), ("AT", (4, 6), 1),
+            ("CATS", (5, 4), 0), ("SCAT", (5, 3), 0), ("TA", (5, 6), 1),
+            ("TAS", (5, 6), 1)}),
+])
+def test_moves(myboard, mygaddag, rack, expected):
+    """Every placement through the anchors is found once."""
+    myboard.play_word(Word("CAT", coord=(5, 4), direction=0))
+    generator = MoveGenerator(myboard, rack, mygaddag)
+    moves = [(w, c, d) for w, c, d, _placed in generator.moves()]
+    assert len(moves) == len(set(moves))
+    assert set(moves) == expected
+
+
+def test_score(myboard, mygaddag, mytilebag):
+    """Scores from the board arrays match scoring the built words."""
+    myboard.play_word(Word("CAT", coord=(5, 4), direction=0))
+    generator = MoveGenerator(myboard.snapshot(), "AS0", mygaddag)
+    for word, coord, direction, placed in generator.moves():
+        move = Word(word, coord=coord, direction=direction)
+        move.blanks = tuple([index for index, blank in placed if blank])
+        squares = myboard.get_square_xy(word, coord[0], coord[1], direction)
+        move.compute_word_score(squares, mytilebag)
+        bonus_words = generator.bonus_words(word, coord, direction, placed)
+        for bword in bonus_words:
+            bword.compute_word_score(mytilebag)
+        score = move.score + sum([x.score for x in bonus_words])
+        assert generator.score(word, coord, direction, placed,
+                               mytilebag.values) == score
+
+
+def test_find_moves(myboard, mygaddag, mytilebag):
+    """Moves are compact records that build into the scored words."""
+    myboard.play_word(Word("CAT", coord=(5, 4), direction=0))
+    generator = MoveGenerator(myboard, "")
+    moves = find_moves(myboard.anchors(), myboard.snapshot(), "AS",
+                       mytilebag.values)
+    assert moves and all([isinstance(move, Move) for move in moves])
+    scores = [move.score for move in moves]
+    assert scores == sorted(scores, reverse=True)
+    for move in moves:
+        assert pickle.loads(pickle.dumps(move)) == move
+        _parent, _word, bonus_words, total = build_move(
+            generator, mytilebag, move)["data"]
+        assert total == move.score
+        assert len(bonus_words) == len(move.bonus)
+
+
+@pytest.mark.parametrize("k", [1, 2, 5])
+def test_find_moves_k(myboard, mygaddag, mytilebag, k):
+    """The bounded heap keeps the k best of every placement."""
+    myboard.play_word(Word("CAT", coord=(5, 4), direction=0))
+    anchors = myboard.anchors()
+    every = find_moves(anchors, myboard.snapshot(), "AS0", mytilebag.values)
+    assert len(every) > 5
+    assert find_moves(anchors, myboard.snapshot(), "AS0", mytilebag.values,
+                      k) == every[:k]
+
+
+def test_find_moves_seen(myboard, mygaddag, mytilebag):
+    """A placement reached from several anchors is kept once."""
+    myboard.play_word(Word("CAT", coord=(5, 4), direction=0))
+    anchors = myboard.anchors()
+    moves = find_moves(anchors, myboard.snapshot(), "AS", mytilebag.values)
+    again = find_moves(anchors + anchors, myboard.snapshot(), "AS",
+                       mytilebag.values)
+    assert again == moves
+    assert len(set([move.key for move in moves])) == len(moves)
+    seen = set([moves[0].key])
+    assert find_moves(anchors, myboard.snapshot(), "AS", mytilebag.values,
+                      seen=seen) == moves[1:]
+    assert moves[0].key == move_key(moves[0].word, moves[0].coord,
+                                    moves[0].direction, moves[0].placed)
+
+
+@pytest.mark.parametrize("chunks", [1, 2, 3, 4])
+def test_find_moves_ties(myboard, mygaddag, mytilebag, chunks):
+    """Ties break the same whichever worker finds the moves."""
+    myboard.play_word(Word("CAT", coord=(5, 4), direction=0))
+    anchors = myboard.anchors()
+    expected = find_moves(anchors, myboard.snapshot(), "AS", mytilebag.values)
+    for k in range(1, len(expected) + 1):
+        found = {}
+        for i in range(chunks):
+            for move in find_moves(anchors[i::chunks], myboard.snapshot(),
+                                   "AS", mytilebag.values, k):
+                found[move.key] = move
+        assert sorted(found.values(), reverse=True)[:k] == expected[:k]
+
+
+def test_moves_narrow_board(tmpdir, mylexicon, mygaddag, mytilebag):
+    """Across words run the height of a board, down words its width.
+
+    Every move generated builds and plays on the board.
+    """
+    layout = tmpdir.join("narrow.csv")
+    layout.write("\n".join(["sl,sl,sl"] * 4 + ["sl,c,sl"] + ["sl,sl,sl"] * 4))
+    board = Board(str(layout), mytilebag, lexicon=mylexicon)
+    generator = MoveGenerator(board, "CATS", mygaddag)
+    moves = list(generator.moves())
+    assert max([len(word) for word, _coord, direction, _placed in moves
+                if direction == 0]) == 4
+    assert max([len(word) for word, _coord, direction, _placed in moves
+                if direction == 1]) == 3
+    for word, coord, direction, placed in moves:
+        move = Move(0, word, coord[0], coord[1], direction, placed, ())
+        _parent, _word, _bonus_words, total = build_move(
+            MoveGenerator(board, "", mygaddag), mytilebag, move)["data"]
+        assert total == generator.score(word, coord, direction, placed,
+                                        mytilebag.values)
+        played = Board(str(layout), mytilebag, lexicon=mylexicon)
+        played.play_word(Word(word, coord=coord, direction=direction))
+        assert "".join([square.tile_letter for square in played.get_square_xy(
+                        word, coord[0], coord[1], direction)]) == word
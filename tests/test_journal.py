@@ -0,0 +1,105 @@
+import os
+import pytest
+from os import path as p
+from wwfs.board import Board
+from wwfs.game import Game
+from wwfs.journal import Journal
+from wwfs.savegame import replay
+from wwfs.tiles import TileBag
+
+_wwfs = p.dirname(p.abspath(__file__))
+test_data = p.join(_wwfs, '..', 'wwfs', 'data')
+
+
+@pytest.fixture
+def mygame():
+    tilebag = TileBag(p.join(test_data, 'tiles.csv'))
+    return Game(board=Board(p.join(test_data, 'board.csv'), tilebag),
+                tilebag=tilebag, mode="new")
+
+
+@pytest.fixture
+def myjournal(tmpdir):
+    return Journal(str(tmpdir.join("game.journal")), snapshot_every=2)
+
+
+def test_journal_replay(mygame, myjournal):
+    """Each turn appends one record, any turn can be rebuilt."""
+    replay(mygame, [("THECAT", (5, 3), 0, 1, 20, (2,))])
+    myjournal.record(mygame)
+    size = os.path.getsize(myjournal.fname)
+    replay(mygame, [("AT", (4, 8), 1, 2, 4, ())])
+    myjournal.record(mygame)
+    myjournal.record(mygame)
+    assert len(myjournal) == 2
+    record_size = os.path.getsize(myjournal.fname) - size
+    replay(mygame, [("TO", (3, 9), 0, 1, 4, ())])
+    myjournal.record(mygame)
+    assert os.path.getsize(myjournal.fname) - size == 2 * record_size
+    game = Journal(myjournal.fname).game()
+    assert (game.board.arrays.letters == mygame.board.arrays.letters).all()
+    assert (game.board.arrays.blanks == mygame.board.arrays.blanks).all()
+    assert game.status.player1total == mygame.status.player1total
+    assert game.tilebag.remaining == mygame.tilebag.remaining
+    first = myjournal.game(1)
+    assert first.status.turn_count == 1
+    assert first.board.tile_grid[4][8].free
+    with pytest.raises(ValueError):
+        myjournal.game(4)
+
+
+def test_journal_snapshot(mygame, myjournal):
+    """Replays start from the latest snapshot at or before the turn."""
+    replay(mygame, [("THECAT", (5, 3), 0, 1, 20, ())])
+    myjournal.record(mygame)
+    assert not os.path.exists(myjournal.snapshot_fname)
+    replay(mygame, [("AT", (4, 8), 1, 2, 4, ()),
+                    ("TO", (3, 9), 0, 1, 4, ())])
+    myjournal.record(mygame)
+    assert myjournal._load_snapshot(3)[1] == 3
+    assert myjournal._load_snapshot(2) == (None, 0)
+    assert myjournal.game(2).status.turn_count == 2
+    with open(myjournal.snapshot_fname, 'r+b') as fhandle:
+        fhandle.truncate(20)
+    assert myjournal.game().status.player2total == (
+                                                mygame.status.player2total)
+
+
+def test_journal_no_pickle(mygame, myjournal):
+    """Without pickles snapshots are neither written nor loaded."""
+    replay(mygame, [("THECAT", (5, 3), 0, 1, 20, ()),
+                    ("AT", (4, 8), 1, 2, 4, ())])
+    myjournal.record(mygame)
+    untrusted = Journal(myjournal.fname, snapshot_every=2, allow_pickle=False)
+    assert untrusted._load_snapshot(2) == (None, 0)
+    assert untrusted.game().status.turn_count == 2
+    os.remove(myjournal.snapshot_fname)
+    replay(mygame, [("TO", (3, 9), 0, 1, 4, ()),
+                    ("OX", (2, 10), 1, 2, 18, ())])
+    untrusted.record(mygame)
+    assert not os.path.exists(myjournal.snapshot_fname)
+
+
+def test_journal_torn_append(mygame, myjournal):
+    """A partly written record is ignored, then dropped on the next write."""
+    replay(mygame, [("THECAT", (5, 3), 0, 1, 20, ())])
+    myjournal.record(mygame)
+    size = os.path.getsize(myjournal.fname)
+    with open(myjournal.fname, 'ab') as fhandle:
+        fhandle.write(b"\x05\x03\x00")
+    assert len(myjournal.moves()) == 1
+    replay(mygame, [("AT", (4, 8), 1, 2, 4, ())])
+    myjournal.record(mygame)
+    assert len(myjournal.moves()) == 2
+    with open(myjournal.fname, 'r+b') as fhandle:
+        fhandle.seek(size)
+        fhandle.write(b"\xff")
+    assert len(myjournal.moves()) == 1
+    assert myjournal.recover() == 1
+    assert os.path.getsize(myjournal.fname) == size
+    myjournal.record(mygame)
+    with open(myjournal.fname, 'r+b') as fhandle:
+        fhandle.seek(size - 1)
+        fhandle.write(b"\xff")
+    with pytest.raises(ValueError):
+        myjournal.game()
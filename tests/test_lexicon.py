@@ -0,0 +1,177 @@
+import os
+import pickle
+import subprocess
+import sys
+import pytest
+from wwfs.lexicon import (AnagramIndex, LazyLexicon, Lexicon, letter_counts,
+                          signature)
+
+
+@pytest.fixture
+def mylexicon():
+    return Lexicon(["CAT", "CATS", "CATCH", "DOG", "DOGS", "SCAT", "ACT",
+                    "TAC"])
+
+
+def test_lexicon_instansiate(mylexicon):
+    """Can instansiate a Lexicon, shared suffixes are merged."""
+    assert isinstance(mylexicon, Lexicon)
+    assert len(mylexicon) == 8
+    assert mylexicon.node_count < sum(len(x) for x in mylexicon)
+
+
+@pytest.mark.parametrize("word, expected", [
+    ("CAT", True), ("CATS", True), ("CA", False), ("CATCHES", False),
+    ("", False), ("XYZ", False)
+])
+def test_contains(mylexicon, word, expected):
+    """Lexicon membership behaves like the word set."""
+    assert (word in mylexicon) == expected
+
+
+def test_iterates_sorted(mylexicon):
+    """Iterating the lexicon yields all words in sorted order."""
+    assert list(mylexicon) == ["ACT", "CAT", "CATCH", "CATS", "DOG", "DOGS",
+                               "SCAT", "TAC"]
+
+
+@pytest.mark.parametrize("prefix, expected", [
+    ("CAT", ["CAT", "CATCH", "CATS"]), ("DO", ["DOG", "DOGS"]), ("Q", [])
+])
+def test_words_with_prefix(mylexicon, prefix, expected):
+    """Can walk all words below a prefix."""
+    assert list(mylexicon.words(prefix)) == expected
+
+
+def test_children(mylexicon):
+    """Can enumerate letters that continue a prefix."""
+    node = mylexicon.walk("CAT")
+    assert [l for l, _child in mylexicon.children(node)] == ["C", "S"]
+    assert mylexicon.child(node, "S") == mylexicon.walk("CATS")
+    assert mylexicon.child(node, "X") is None
+
+
+@pytest.mark.parametrize("letters, expected", [
+    ("TAC", {"ACT", "CAT", "TAC"}), ("STAC", {"ACT", "CAT", "CATS", "SCAT",
+                                               "TAC"}),
+    ("CAHTC", {"ACT", "CAT", "CATCH", "TAC"}), ("XYZ", set())
+])
+def test_anagrams(mylexicon, letters, expected):
+    """Can find all words spelled from a rack of letters."""
+    assert mylexicon.anagrams(letters) == expected
+
+
+@pytest.fixture
+def mywordlist(tmp_path):
+    wordlist = tmp_path / "words"
+    wordlist.write_text("cat\ncats\ncatch\ndog\ndog's\n")
+    return str(wordlist)
+
+
+def test_save_load(mylexicon, tmp_path):
+    """A saved lexicon maps back with the same words."""
+    fname = str(tmp_path / "lexicon.dawg")
+    mylexicon.save(fname, "ab" * 32)
+    observed = Lexicon.load(fname, "ab" * 32)
+    assert list(observed) == list(mylexicon)
+    assert "CATCH" in observed
+    assert observed.node_count == mylexicon.node_count
+
+
+def test_load_out_of_date(mylexicon, tmp_path):
+    """A lexicon compiled from another word list is refused."""
+    fname = str(tmp_path / "lexicon.dawg")
+    mylexicon.save(fname, "ab" * 32)
+    with pytest.raises(ValueError):
+        Lexicon.load(fname, "cd" * 32)
+
+
+def test_from_wordlist(mywordlist, tmp_path):
+    """Compiled file is written on first load and mapped after."""
+    cache_dir = str(tmp_path / "cache")
+    built = Lexicon.from_wordlist(mywordlist, cache_dir)
+    assert built._fname is None
+    mapped = Lexicon.from_wordlist(mywordlist, cache_dir)
+    assert mapped._fname is not None
+    assert list(mapped) == list(built) == ["CAT", "CATCH", "CATS", "DOG"]
+
+
+def test_pickle_mapped(mywordlist, tmp_path):
+    """A mapped lexicon pickles by filename."""
+    fname = Lexicon.compile(mywordlist, str(tmp_path))
+    mapped = Lexicon.load(fname)
+    data = pickle.dumps(mapped)
+    assert len(data) < 200
+    assert list(pickle.loads(data)) == list(mapped)
+
+
+def test_lazy_lexicon(mywordlist, tmp_path):
+    """Lazy lexicon loads on first lookup and pickles unloaded."""
+    lazy = LazyLexicon(wordlist=mywordlist, cache_dir=str(tmp_path))
+    assert not lazy.loaded
+    assert "CATS" in lazy
+    assert lazy.loaded
+    assert lazy.walk("DOG") == lazy.load().walk("DOG")
+    assert not pickle.loads(pickle.dumps(lazy)).loaded
+
+
+def test_config_skips_numpy():
+    """Importing the lexicons leaves numpy to the first count."""
+    subprocess.check_call([sys.executable, "-c", "import sys, wwfs.config; "
+                           "assert 'numpy' not in sys.modules"])
+
+
+def test_lazy_lexicon_environment(mywordlist, tmp_path):
+    """Runs load the word list and cache directory of the environment."""
+    env = dict(os.environ, WWFS_WORDLIST=mywordlist,
+               WWFS_CACHE_DIR=str(tmp_path))
+    output = subprocess.check_output(
+                [sys.executable, "-c", "from wwfs.config import DICT; "
+                 "print(sorted(DICT), DICT.load()._fname)"], env=env)
+    words, fname = output.decode().rsplit(" ", 1)
+    assert words == "['CAT', 'CATCH', 'CATS', 'DOG']"
+    assert fname.strip() == "None"
+    assert os.listdir(str(tmp_path))
+
+
+@pytest.fixture
+def myanagrams():
+    return AnagramIndex(["CAT", "CATS", "CATCH", "DOG", "DOGS", "SCAT", "ACT",
+                         "TAC"])
+
+
+def test_anagram_lookup(myanagrams):
+    """Words are indexed by their sorted letters."""
+    assert signature("CATS") == "ACST"
+    assert myanagrams.lookup("TCA") == {"ACT", "CAT", "TAC"}
+    assert myanagrams.lookup("GOD") == {"DOG"}
+    assert myanagrams.lookup("XYZ") == set()
+
+
+@pytest.mark.parametrize("letters, wildcards, expected", [
+    ("TAC", 0, {"ACT", "CAT", "TAC"}),
+    ("STAC", 0, {"ACT", "CAT", "CATS", "SCAT", "TAC"}),
+    ("TAC", 1, {"ACT", "CAT", "CATS", "SCAT", "TAC"}),
+    ("DO", 1, {"DOG"}), ("DO", 2, {"DOG", "DOGS"}),
+    ("XYZ", 0, set()), ("", 3, {"ACT", "CAT", "DOG", "TAC"})
+])
+def test_anagram_formable(myanagrams, letters, wildcards, expected):
+    """Can find all words in a rack, blanks stand for any letter."""
+    assert myanagrams.formable(letters, wildcards) == expected
+
+
+def test_anagram_search(myanagrams):
+    """Words found with blanks record the letters the blanks stand for."""
+    found = myanagrams.search("TAC", 1)
+    assert found["CAT"] == ""
+    assert found["CATS"] == "S"
+    assert myanagrams.search("DO", 2)["DOGS"] == "GS"
+
+
+def test_letter_counts():
+    """Words are counted into 26 letter slots, blanks are not counted."""
+    counts = letter_counts(["CAT", "AA0", ""])
+    assert counts.shape == (3, 26)
+    assert counts[0].sum() == 3 and counts[0][2] == 1
+    assert counts[1][0] == 2 and counts[1].sum() == 2
+    assert not counts[2].any()
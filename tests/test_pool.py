@@ -0,0 +1,23 @@
+import pickle
+from wwfs.pool import SolverPool
+
+
+def test_pool_reused():
+    """The same workers serve every call until the pool is closed."""
+    with SolverPool(2) as mypool:
+        assert mypool.workers == 2
+        assert mypool.apply_async(len, ("CAT", )).get() == 3
+        pool = mypool.pool
+        assert mypool.apply_async(len, ("CATS", )).get() == 4
+        assert mypool.pool is pool
+    assert mypool._pool is None
+
+
+def test_pool_pickle():
+    """Pickling keeps the worker count, not the processes."""
+    mypool = SolverPool(3).start()
+    assert mypool._pool is not None
+    observed = pickle.loads(pickle.dumps(mypool))
+    mypool.close()
+    assert observed.workers == 3
+    assert observed._pool is None
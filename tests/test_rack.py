@@ -4,7 +4,7 @@ from collections import Counter
 from wwfs.word import Word
 from wwfs.board import Board
 from wwfs.tiles import TileBag
-from wwfs.rack import Rack
+from wwfs.rack import Rack, blank_positions
 
 
 _wwfs = p.dirname(p.abspath(__file__))
@@ -56,7 +56,7 @@ def test_compute_all_play_word_scores(myrack, myboard, mytilebag,
     myrack.compute_all_play_word_scores(myboard, mytilebag)
     count = Counter()
     for i in myrack.word_scores:
-        count[i.word] += 1
+        count[i["word"]] += 1
     xa = {len(x) for x in myrack.words}
     xb = {x for x in count.values()}
     observed = dict(zip(sorted(list(xa)), sorted(list(xb), reverse=True)))
@@ -67,10 +67,10 @@ def test_compute_all_play_word_scores(myrack, myboard, mytilebag,
 
 def test_first_word(myrack, myboard, mytilebag):
     """Test first played is highest scoring word that passes through center."""
-    myrack.compute_all_play_word_scores(myboard, mytilebag)
-    myrack.first_word(myboard)
-    assert (myrack.best_first_word.__hash__() ==
-            Word('DECAF', coord=(5, 5), direction=0).__hash__())
+    word = myrack.first_word(myboard, mytilebag)
+    assert word.word == 'DECAF'
+    assert word.x == 5 and word.y <= 5 < word.y + len(word)
+    assert word.direction == 0
 
 
 @pytest.mark.parametrize("ldiffs, expected", [
@@ -84,3 +84,30 @@ def test_has_enough_letters(myrack, ldiffs, expected):
     assert expected == observed
 
 # TODO: Test blanks in Rack
+
+
+@pytest.mark.parametrize("word, blank_letters, expected", [
+    ("CATS", "", ()), ("CATS", "S", (3,)), ("TASTY", "T", (3,)),
+    ("TASTY", "TT", (0, 3))
+])
+def test_blank_positions(word, blank_letters, expected):
+    """Blanks are played at the last free occurrence of their letter."""
+    assert blank_positions(word, blank_letters) == expected
+
+
+def test_has_enough_letters_blanks():
+    """Blanks make up for letters missing from the rack."""
+    myrack = Rack("CA0", player=2)
+    myrack.make_racks()
+    assert myrack.has_enough_letters(Counter("CAT"))
+    assert not myrack.has_enough_letters(Counter("CATS"))
+
+
+@pytest.mark.parametrize("words, board_letters, expected", [
+    (["CAB", "FADE", "ABBA", "GAFFE"], "", ["CAB", "FADE"]),
+    (["CABS", "ABBA", "DEBS"], "SB", ["CABS", "DEBS"]),
+    ([], "", [])
+])
+def test_playable(myrack, words, board_letters, expected):
+    """Can check many words against the rack at once."""
+    assert myrack.playable(words, board_letters) == expected
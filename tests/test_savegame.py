@@ -0,0 +1,85 @@
+import pickle
+import struct
+import pytest
+from os import path as p
+import wwfs.utils as utils
+from wwfs.board import Board
+from wwfs.game import Game
+from wwfs.savegame import GameRecord, is_record, replay
+from wwfs.tiles import TileBag
+
+_wwfs = p.dirname(p.abspath(__file__))
+test_data = p.join(_wwfs, '..', 'wwfs', 'data')
+
+
+@pytest.fixture
+def mygame():
+    tilebag = TileBag(p.join(test_data, 'tiles.csv'))
+    game = Game(board=Board(p.join(test_data, 'board.csv'), tilebag),
+                tilebag=tilebag, mode="new")
+    replay(game, [("THECAT", (5, 3), 0, 1, 20, (2,)),
+                  ("AT", (4, 8), 1, 2, 4, ())])
+    return game
+
+
+def test_record_round_trip(mygame, tmpdir):
+    """A saved game reads back and replays to the same board and scores."""
+    fname = str(tmpdir.join("game.wwfs"))
+    GameRecord.from_game(mygame).write(fname)
+    assert is_record(fname)
+    record = GameRecord.read(fname)
+    assert record.letters[3] == ".....T....."
+    assert record.letters[5] == ".....e....."
+    assert record.letters[8] == "....AT....."
+    assert record.moves[0] == ("THECAT", (5, 3), 0, 1,
+                               mygame.status.all_played.words[0].score, (2,))
+    game = record.game()
+    assert (game.board.arrays.letters == mygame.board.arrays.letters).all()
+    assert (game.board.arrays.blanks == mygame.board.arrays.blanks).all()
+    assert game.board.anchors() == mygame.board.anchors()
+    assert game.tilebag.remaining == mygame.tilebag.remaining
+    assert game.status.player1total == mygame.status.player1total
+    assert game.status.player2total == mygame.status.player2total
+
+
+def test_record_invalid(mygame, tmpdir):
+    """Files of another version, cut short or not matching are refused."""
+    fname = str(tmpdir.join("game.wwfs"))
+    GameRecord.from_game(mygame).write(fname)
+    with open(fname, 'rb') as fhandle:
+        data = fhandle.read()
+    for bad in (data[:8] + b"\x02" + data[9:], data[:-3], data + b"x"):
+        with open(fname, 'wb') as fhandle:
+            fhandle.write(bad)
+        with pytest.raises(ValueError):
+            GameRecord.read(fname)
+    record = GameRecord.from_game(mygame)
+    record.letters[0] = "A" + record.letters[0][1:]
+    with pytest.raises(ValueError):
+        record.game()
+
+
+def test_record_failed_write(mygame, tmpdir):
+    """A write that fails part way leaves the last save in place."""
+    fname = str(tmpdir.join("game.wwfs"))
+    GameRecord.from_game(mygame).write(fname)
+    record = GameRecord.from_game(mygame)
+    word, coord, direction, player, _score, blanks = record.moves[-1]
+    record.moves[-1] = (word, coord, direction, player, 1 << 20, blanks)
+    with pytest.raises(struct.error):
+        record.write(fname)
+    assert GameRecord.read(fname).moves == GameRecord.from_game(
+                                                            mygame).moves
+
+
+def test_utils_load_pickle(mygame, tmpdir):
+    """Games pickled by earlier versions still load."""
+    fname = str(tmpdir.join("game.pkl"))
+    with open(fname, 'wb') as fhandle:
+        pickle.dump(mygame, fhandle)
+    assert not is_record(fname)
+    assert utils.load(fname).status.player1total == (
+                                            mygame.status.player1total)
+    utils.save(fname, mygame)
+    assert is_record(fname)
+    assert utils.load(fname).status.turn_count == 2
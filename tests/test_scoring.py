@@ -0,0 +1,70 @@
+import pytest
+from os import path as p
+from wwfs.board import Board
+from wwfs.scoring import first_move_scores, placement_scores
+from wwfs.tiles import TileBag
+from wwfs.word import Word
+
+_wwfs = p.dirname(p.abspath(__file__))
+test_data = p.join(_wwfs, '..', 'wwfs', 'data')
+
+
+@pytest.fixture
+def myboard():
+    return Board(p.join(test_data, 'board.csv'))
+
+
+@pytest.fixture
+def mytilebag():
+    return TileBag(p.join(test_data, 'tiles.csv'))
+
+
+@pytest.mark.parametrize("words, expected", [
+    (["CAT"], 2 * (9 * 11)), (["CAT", "HORSE"], 2 * (9 * 11 + 7 * 11)),
+    (["ABCDEFGHIJKL"], 0)
+])
+def test_placement_count(myboard, mytilebag, words, expected):
+    """Every placement that fits the board is scored."""
+    placements = placement_scores([Word(x) for x in words], myboard,
+                                  mytilebag)
+    assert len(placements) == expected
+
+
+def test_placement_scores(myboard, mytilebag):
+    """Batch scores match scoring each placement on its own."""
+    words = [Word("CAT"), Word("FROG"), Word("HORSE")]
+    words[1].blanks = (0,)
+    placements = placement_scores(words, myboard, mytilebag)
+    scores = [x["score"] for x in placements]
+    assert scores == sorted(scores, reverse=True)
+    for placement in placements[::37]:
+        word = Word(placement["word"])
+        word.blanks = (0,) if word.word == "FROG" else ()
+        squares = myboard.get_square_xy(word, placement["x"], placement["y"],
+                                        placement["direction"])
+        word.compute_word_score(squares, mytilebag)
+        assert word.score == placement["score"]
+
+
+def test_first_move_scores(myboard, mytilebag):
+    """First moves cover the center and match the best full placement."""
+    words = [Word("CAT"), Word("FROG"), Word("HORSE")]
+    top = first_move_scores(words, myboard, mytilebag, 3)
+    assert len(top) == 3
+    for placement in top:
+        assert placement["x"] == 5 and placement["direction"] == 0
+        assert placement["y"] <= 5 < placement["y"] + len(placement["word"])
+    placements = placement_scores(words, myboard, mytilebag)
+    covering = [x["score"] for x in placements
+                if (x["x"] == 5 and x["direction"] == 0 and
+                    x["y"] <= 5 < x["y"] + len(x["word"]))]
+    assert top[0]["score"] == max(covering)
+
+
+@pytest.mark.parametrize("k", [1, 5, 50])
+def test_placement_scores_top_k(myboard, mytilebag, k):
+    """The top k placements are the head of the full ranking."""
+    words = [Word("CAT"), Word("FROG"), Word("HORSE")]
+    placements = placement_scores(words, myboard, mytilebag)
+    top = placement_scores(words, myboard, mytilebag, k)
+    assert top.tolist() == placements[:k].tolist()
@@ -0,0 +1,141 @@
+import json
+import os
+import pickle
+import shutil
+import socket
+import stat
+import threading
+import pytest
+from argparse import Namespace
+from http.client import HTTPConnection
+from os import path as p
+from wwfs.pool import SolverPool
+from wwfs.serve import (SolverServer, UnixSolverServer, parse_address,
+                        request, turn_request)
+from wwfs.session import SessionStore
+
+_wwfs = p.dirname(p.abspath(__file__))
+test_data = p.join(_wwfs, '..', 'wwfs', 'data')
+
+
+@pytest.fixture
+def myserver(tmpdir):
+    root = tmpdir.mkdir("root")
+    for fname in ("board.csv", "tiles.csv"):
+        shutil.copy(p.join(test_data, fname), str(root))
+    pool = SolverPool(1)
+    server = SolverServer(("127.0.0.1", 0), pool,
+                          p.join(test_data, "board.csv"),
+                          p.join(test_data, "tiles.csv"),
+                          SessionStore(str(tmpdir), max_games=1), str(root))
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield "127.0.0.1:{}".format(server.server_address[1])
+    server.shutdown()
+    server.server_close()
+    pool.close()
+
+
+def test_parse_address():
+    """Ports are served on localhost, anything else is a socket path."""
+    assert parse_address("127.0.0.1:8642") == ("127.0.0.1", 8642)
+    assert parse_address("8642") == ("127.0.0.1", 8642)
+    assert parse_address("/tmp/wwfs.sock") == "/tmp/wwfs.sock"
+    assert parse_address("wwfs.sock") == "wwfs.sock"
+
+
+def test_unix_server_path(tmpdir):
+    """A stale socket is replaced, other files at the path are kept."""
+    notes = tmpdir.join("notes.txt")
+    notes.write("keep")
+    with pytest.raises(FileExistsError):
+        UnixSolverServer(str(notes), SolverPool(1))
+    assert notes.read() == "keep"
+    path = str(tmpdir.join("wwfs.sock"))
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(path)
+    stale.close()
+    server = UnixSolverServer(path, SolverPool(1))
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    server.server_close()
+    assert not p.exists(path)
+
+
+def test_turn_request():
+    """Turn arguments are sent with absolute filenames."""
+    args = Namespace(player1=True, player2=False, coord=None, direction=None,
+                     save="game.pkl", load="", board=None, tilebag=None,
+                     rack="aeirst0")
+    observed = turn_request(args)
+    assert observed["rack"] == "aeirst0"
+    assert observed["save"] == p.abspath("game.pkl")
+    assert observed["load"] == ""
+
+
+def test_server(myserver):
+    """Solve a position on the server, bad requests return errors."""
+    observed = request(myserver, "/solve",
+                       {"id": 1, "rack": "aeirst0", "k": 2,
+                        "words": [["CAT", [5, 4], 0]]})
+    assert observed["id"] == 1
+    assert len(observed["moves"]) == 2
+    with pytest.raises(RuntimeError):
+        request(myserver, "/play", {"player1": True, "load": "nothere.pkl"})
+    with pytest.raises(RuntimeError):
+        request(myserver, "/unknown", {})
+    connection = HTTPConnection(*parse_address(myserver))
+    connection.request("GET", "/")
+    assert json.loads(connection.getresponse().read()) == {"workers": 1}
+    connection.close()
+
+
+@pytest.mark.parametrize("headers, status", [
+    ({"Content-Type": "text/plain"}, 415),
+    ({"Content-Type": "application/json", "Host": "example.com"}, 403),
+    ({"Content-Type": "application/json", "Host": "127.0.0.1.example.com"},
+     403)
+])
+def test_server_refuses(myserver, headers, status):
+    """Posts from web pages, not JSON or to another host, are refused."""
+    connection = HTTPConnection(*parse_address(myserver))
+    connection.request("POST", "/solve", json.dumps({"rack": "cat"}),
+                       headers)
+    response = connection.getresponse()
+    assert response.status == status
+    assert "error" in json.loads(response.read())
+    connection.close()
+
+
+def test_server_files(myserver, tmpdir):
+    """Files outside the root are refused, saves are never unpickled."""
+    outside = str(tmpdir.join("outside.pkl"))
+    with pytest.raises(RuntimeError, match="PermissionError"):
+        request(myserver, "/play", {"player1": True, "rack": "thecat0",
+                                    "board": "board.csv",
+                                    "tilebag": "tiles.csv", "save": outside})
+    assert not p.exists(outside)
+    with pytest.raises(RuntimeError, match="PermissionError"):
+        request(myserver, "/solve", {"rack": "cat", "board": "../../x.csv"})
+    with open(str(tmpdir.join("root", "game.pkl")), "wb") as fhandle:
+        pickle.dump({"not": "a game"}, fhandle)
+    with pytest.raises(RuntimeError, match="not a saved game record"):
+        request(myserver, "/play", {"player1": True, "rack": "thecat0",
+                                    "load": "game.pkl"})
+    observed = request(myserver, "/play", {"player1": True, "rack": "thecat0",
+                                           "board": "board.csv",
+                                           "tilebag": "tiles.csv"})
+    assert observed["message"] == "Player 1 starts a new game."
+    assert tmpdir.join("root", "wwfs_game_data.pkl").check()
+
+
+def test_server_games(myserver):
+    """Games named by id are held by the server between turns."""
+    observed = request(myserver, "/play",
+                       {"game": "g1", "player1": True, "rack": "thecat0",
+                        "board": "board.csv", "tilebag": "tiles.csv"})
+    assert observed["message"] == "Player 1 starts a new game."
+    observed = request(myserver, "/play",
+                       {"game": "g1", "player2": True, "rack": "when",
+                        "coord": "4,6", "direction": 1})
+    assert observed["message"] == "Player 2 continues a game."
+    assert observed["summary"].endswith("Turns: 2")
@@ -0,0 +1,81 @@
+import os
+import pytest
+from os import path as p
+from wwfs.board import Board
+from wwfs.game import Game
+from wwfs.session import SessionStore
+from wwfs.tiles import TileBag
+
+_wwfs = p.dirname(p.abspath(__file__))
+test_data = p.join(_wwfs, '..', 'wwfs', 'data')
+
+
+@pytest.fixture
+def mystore(tmpdir):
+    return SessionStore(str(tmpdir), max_games=2)
+
+
+def newgame():
+    tilebag = TileBag(p.join(test_data, 'tiles.csv'))
+    return Game(board=Board(p.join(test_data, 'board.csv'), tilebag),
+                tilebag=tilebag, mode="new")
+
+
+def test_store_evicts_least_recent(mystore):
+    """Games past the budget are dropped, least recent first, and
+    replayed from their journal."""
+    games = dict([(game_id, newgame()) for game_id in "abc"])
+    for game_id in ("a", "b"):
+        with mystore.locked(game_id):
+            mystore.put(game_id, games[game_id])
+    with mystore.locked("a"):
+        assert mystore.get("a") is games["a"]
+    with mystore.locked("c"):
+        mystore.put("c", games["c"])
+    assert len(mystore) == 2
+    assert all([os.path.exists(mystore.path(x)) for x in "abc"])
+    assert "b" in mystore
+    with mystore.locked("b"):
+        observed = mystore.get("b")
+    assert observed is not games["b"]
+    assert observed.status.turn_count == 0
+    assert mystore.get("unknown") is None
+
+
+def test_store_keeps_locked_games(mystore):
+    """A game whose turn is in play is not evicted."""
+    game = newgame()
+    with mystore.locked("a"):
+        mystore.put("a", game)
+        for game_id in ("b", "c"):
+            with mystore.locked(game_id):
+                mystore.put(game_id, newgame())
+        assert mystore.get("a") is game
+    mystore.flush()
+    assert sorted(os.listdir(mystore.directory)) == [
+        "a.journal", "a.journal.snap", "b.journal", "c.journal",
+        "c.journal.snap"]
+
+
+def test_store_drops_locks(mystore):
+    """Locks are only kept while a turn holds or waits for them."""
+    game = newgame()
+    for game_id in "abcde":
+        with mystore.locked(game_id):
+            mystore.put(game_id, game)
+        with mystore.locked(game_id + ".pkl"):
+            pass
+    assert mystore._locks == {}
+    with mystore.locked("a"):
+        with pytest.raises(RuntimeError):
+            with mystore.locked("b"):
+                raise RuntimeError("turn failed")
+        assert list(mystore._locks) == ["a"]
+    assert mystore._locks == {}
+
+
+def test_store_game_ids(mystore):
+    """Game ids must be plain file names."""
+    for game_id in ("../a", "a/b", "..", ""):
+        with pytest.raises(ValueError):
+            mystore.path(game_id)
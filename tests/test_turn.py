@@ -2,8 +2,10 @@ import pytest
 from os import path as p
 from wwfs.word import Word, PlayedWords
 from wwfs.board import Board
+from wwfs.pool import SolverPool
 from wwfs.rack import Rack
 from wwfs.turn import Turn
+import wwfs.turn
 
 _wwfs = p.dirname(p.abspath(__file__))
 test_data = p.join(_wwfs, '..', 'wwfs', 'data')
@@ -43,6 +45,36 @@ def test_turn_instansiate(myrack, myall_played_words, myboard):
     assert isinstance(myturn, Turn)
 
 
+def test_turn_pool_closed_on_error(myrack, myall_played_words, myboard,
+                                   monkeypatch):
+    """A pool started for the turn is closed when the solve fails."""
+    closed = []
+
+    class TurnPool(SolverPool):
+        def close(self):
+            closed.append(self)
+            super().close()
+
+    def solve(self, pool):
+        raise RuntimeError("worker failed")
+
+    monkeypatch.setattr(wwfs.turn, "SolverPool", TurnPool)
+    monkeypatch.setattr(Turn, "solve", solve)
+    myturn = Turn(myrack, myall_played_words, myboard, None, debug=True)
+    with pytest.raises(RuntimeError):
+        myturn.compute_move()
+    assert len(closed) == 1
+
+
+def test_best_word_built_once(myrack, myall_played_words, myboard,
+                              myword1):
+    """The move played is built once, later calls return it."""
+    myturn = Turn(myrack, myall_played_words, myboard, None, debug=True)
+    myturn.turn_word = myword1
+    assert myturn.best_word() is myword1
+    assert myturn.extensions == myturn.crosses == myturn.runs == []
+
+
 def test_get_valid_word_extensions(myrack, myall_played_words, myboard,
                                    myword1, myword2):
     """Test can compute word extensions."""
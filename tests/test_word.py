@@ -4,6 +4,7 @@ from wwfs.word import Word
 from wwfs.board import Board, Square
 from wwfs.tiles import TileBag
 from wwfs.rack import Rack
+from wwfs.extends import get_word_extensions
 
 
 _wwfs = p.dirname(p.abspath(__file__))
@@ -67,7 +68,7 @@ def test_compute_word_score(word, squares, mytilebag, total):
 ])
 def test_get_word_extensions(word, dictionary, rack, expected):
     """Test can find nested words."""
-    observed = word.get_word_extensions(dictionary, rack)
+    observed = get_word_extensions(word, dictionary, rack)
     assert observed == expected
 
 
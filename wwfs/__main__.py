@@ -1,6 +1,8 @@
 """Application wrapper for wwfs."""
 import argparse
-from wwfs.wwfs import main
+import sys
+from os import path as p
+from wwfs.utils import CACHE_DIR, WORDLIST
 
 parser = argparse.ArgumentParser(description=("Words With Friends Puzzle"
                                               "Solver"))
@@ -24,6 +26,21 @@ parser.add_argument('-s', '--save',
 parser.add_argument('-l', '--load',
                     help='Load an activate game board (filename).',
                     default='', type=str)
+parser.add_argument('-j', '--journal',
+                    help='Game journal (filename), each turn is appended to '
+                    'it in place of the save and load files.',
+                    default=None, type=str)
+parser.add_argument('-w', '--workers',
+                    help='Number of worker processes, default one per CPU.',
+                    default=None, type=int)
+parser.add_argument('--connect',
+                    help='Play the turn on a wwfs serve daemon, at its '
+                    'host:port or Unix socket path.',
+                    default=None, type=str)
+parser.add_argument('--game',
+                    help='Id of a game held by the --connect daemon, in '
+                    'place of the save and load files.',
+                    default=None, type=str)
 
 # main positional argument is the filename of a template board
 parser.add_argument('board', nargs="?", help='filename of board')
@@ -34,7 +51,109 @@ parser.add_argument('-v', '--version', action='version',
                     version='%(prog)s 0.1')
 
 
+# subcommands are dispatched on the first argument, before the turn parser
+compile_parser = argparse.ArgumentParser(
+                    prog="wwfs compile-lexicon",
+                    description="Compile the word list into binary lexicon "
+                    "files, loaded by later runs without parsing the list. "
+                    "Runs read the word list and cache directory set by "
+                    "WWFS_WORDLIST and WWFS_CACHE_DIR.")
+compile_parser.add_argument('-w', '--wordlist',
+                            help="Word list to compile, WWFS_WORDLIST if "
+                            "set.",
+                            default=WORDLIST, type=str)
+compile_parser.add_argument('--cache-dir',
+                            help="Directory of compiled lexicon files, "
+                            "WWFS_CACHE_DIR if set.",
+                            default=CACHE_DIR, type=str)
+compile_parser.set_defaults(func="compile_lexicon")
+
+DATA_DIR = p.join(p.dirname(p.abspath(__file__)), "data")
+batch_parser = argparse.ArgumentParser(
+                    prog="wwfs batch",
+                    description="Solve positions read as JSON lines, each "
+                    "an object of its rack, played words and optional id, "
+                    "board and tilebag. Writes the best moves as JSON lines.")
+batch_parser.add_argument('positions', nargs="?",
+                          help="JSON lines positions file, - for stdin.",
+                          default="-", type=str)
+batch_parser.add_argument('-o', '--output',
+                          help="JSON lines results file, - for stdout.",
+                          default="-", type=str)
+batch_parser.add_argument('-b', '--board',
+                          help="Default board design (filename).",
+                          default=p.join(DATA_DIR, "board.csv"), type=str)
+batch_parser.add_argument('-t', '--tilebag',
+                          help="Default tile letter bag (filename).",
+                          default=p.join(DATA_DIR, "tiles.csv"), type=str)
+batch_parser.add_argument('-k', '--k',
+                          help="Number of best moves per position.",
+                          default=1, type=int)
+batch_parser.add_argument('-u', '--unordered',
+                          help="Write results as they finish.",
+                          action="store_true")
+batch_parser.add_argument('--chunksize',
+                          help="Positions sent to a worker at a time.",
+                          default=16, type=int)
+batch_parser.add_argument('-w', '--workers',
+                          help='Number of worker processes, default one per '
+                          'CPU.', default=None, type=int)
+batch_parser.set_defaults(func="batch")
+
+serve_parser = argparse.ArgumentParser(
+                    prog="wwfs serve",
+                    description="Keep the lexicon and worker pool loaded, "
+                    "playing turns and solving positions posted as JSON.")
+serve_parser.add_argument('address', nargs="?",
+                          help="host:port on localhost, or a Unix socket "
+                          "path. Defaults to wwfs.sock in the cache "
+                          "directory, which only the user can connect to.",
+                          default=None, type=str)
+serve_parser.add_argument('--sessions',
+                          help="Directory games are evicted to, defaults to "
+                          "games in the cache directory.",
+                          default=None, type=str)
+serve_parser.add_argument('--max-games',
+                          help="Games held in memory between turns.",
+                          default=1000, type=int)
+serve_parser.add_argument('-b', '--board',
+                          help="Default board design of solved positions.",
+                          default=p.join(DATA_DIR, "board.csv"), type=str)
+serve_parser.add_argument('-t', '--tilebag',
+                          help="Default tile letter bag of solved positions.",
+                          default=p.join(DATA_DIR, "tiles.csv"), type=str)
+serve_parser.add_argument('-w', '--workers',
+                          help='Number of worker processes, default one per '
+                          'CPU.', default=None, type=int)
+serve_parser.add_argument('--root',
+                          help="Directory of the files turns and positions "
+                          "may name, defaults to the current directory.",
+                          default=None, type=str)
+serve_parser.set_defaults(func="serve")
+
+COMMANDS = {"compile-lexicon": compile_parser, "batch": batch_parser,
+            "serve": serve_parser}
+
+
 def run_wwfs():
     """Launch application via this main routine."""
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        args = COMMANDS[sys.argv[1]].parse_args(sys.argv[2:])
+        # modules are imported once their command runs, keeping --help quick
+        from wwfs import wwfs
+        getattr(wwfs, args.func)(args)
+        return
     args = parser.parse_args()
+    if args.game and not args.connect:
+        parser.error("--game needs --connect")
+    if args.connect:
+        from wwfs.serve import request, turn_request
+        try:
+            reply = request(args.connect, "/play", turn_request(args))
+        except (OSError, RuntimeError) as err:
+            sys.exit("wwfs serve {}: {}".format(args.connect, err))
+        for key in ("message", "board", "status", "summary"):
+            print(reply[key])
+        return
+    from wwfs.wwfs import main
     main(args)
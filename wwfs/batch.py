@@ -0,0 +1,87 @@
+"""Solve many positions, read and written as JSON lines."""
+import json
+from functools import partial
+from wwfs.board import Board
+from wwfs.gaddag import find_moves
+from wwfs.tiles import TileBag
+from wwfs.word import Word
+
+_TILEBAGS = {}
+
+
+def load_tilebag(fname):
+    """Return the tile bag of fname, parsed once per process."""
+    if fname not in _TILEBAGS:
+        _TILEBAGS[fname] = TileBag(fname)
+    return _TILEBAGS[fname]
+
+
+def position_board(position, board, tilebag):
+    """Return a board with the played words of position placed on it.
+
+    Played words are [word, [x, y], direction] lists, with an optional
+    list of the indices played with a blank, placed in order.
+    """
+    tilebag = load_tilebag(position.get("tilebag", tilebag))
+    layout = Board(position.get("board", board), tilebag)
+    for played in position.get("words", []):
+        word = Word(played[0].upper(), coord=tuple(played[1]),
+                    direction=played[2])
+        if len(played) > 3:
+            word.blanks = tuple(played[3])
+        layout.play_word(word)
+    return layout, tilebag
+
+
+def solve_position(line, board=None, tilebag=None, k=1):
+    """Return the k best moves of a JSON line position, as a JSON line.
+
+    A position is an object of its rack, letters with 0 for blanks, the
+    played words and optionally its id and board and tile bag filenames,
+    which default to board and tilebag. A position that cannot be read,
+    or whose files cannot be, returns its error instead of moves.
+    """
+    try:
+        position = json.loads(line)
+        if not isinstance(position, dict):
+            raise TypeError("A position is an object, not {}.".format(
+                                                    type(position).__name__))
+        layout, bag = position_board(position, board, tilebag)
+        letters = "".join(sorted(position["rack"].strip().upper()))
+        moves = find_moves(layout.anchors(), layout.snapshot(), letters,
+                           bag.values, k)
+    except (KeyError, IndexError, OSError, TypeError, ValueError) as err:
+        return json.dumps({"id": _position_id(line),
+                           "error": "{}: {}".format(type(err).__name__, err)})
+    return json.dumps({"id": position.get("id"),
+                       "moves": [move_record(move) for move in moves]})
+
+
+def move_record(move):
+    """Return a Move as a JSON serialisable dict."""
+    return {"word": move.word, "coord": list(move.coord),
+            "direction": move.direction, "score": int(move.score),
+            "blanks": [index for index, blank in move.placed if blank],
+            "bonus": [list(span) for span in move.bonus]}
+
+
+def _position_id(line):
+    """Return the id of a position line, None if it is unreadable."""
+    try:
+        return json.loads(line).get("id")
+    except (AttributeError, ValueError):
+        return None
+
+
+def solve_positions(lines, pool, board=None, tilebag=None, k=1,
+                    ordered=True, chunksize=1):
+    """Yield the solved JSON line of each position line.
+
+    Whole positions are shared out between the pool workers, which keep
+    the lexicon loaded between them. Results are yielded in input order,
+    or as they finish if ordered is False.
+    """
+    lines = (line for line in lines if line.strip())
+    task = partial(solve_position, board=board, tilebag=tilebag, k=k)
+    imap = pool.imap if ordered else pool.imap_unordered
+    return imap(task, lines, chunksize)
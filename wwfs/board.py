@@ -1,16 +1,43 @@
 """Board builds a playing grid from input code."""
 
-import pandas as pd
+import csv
+from copy import deepcopy
 from functools import total_ordering
-from wwfs.config import DICT
+import numpy as np
+from wwfs.config import ALL_LETTERS, ALPHA, DICT, LETTER_BITS
 from wwfs.word import BonusWord
 
 
+class SquareArrays(object):
+    """Per square state of a board, as arrays indexed [x, y].
+
+    letters holds the character code of each played tile, 0 when free.
+    Cross checks are kept per direction of play, indexed [direction, x, y]:
+    cross_checks is a bit mask of the letters that form a valid cross word,
+    crossed flags squares where a cross word is formed and cross_scores is
+    the value of the tiles the cross word reuses.
+    """
+
+    def __init__(self, width, height):
+        """Allocate the arrays of an empty width x height board."""
+        shape = (width, height)
+        self.letters = np.zeros(shape, dtype=np.uint8)
+        self.occupied = np.zeros(shape, dtype=bool)
+        self.blanks = np.zeros(shape, dtype=bool)
+        self.letter_multipliers = np.ones(shape, dtype=np.int8)
+        self.word_multipliers = np.ones(shape, dtype=np.int8)
+        self.cross_checks = np.full((2,) + shape, ALL_LETTERS,
+                                    dtype=np.uint32)
+        self.crossed = np.zeros((2,) + shape, dtype=bool)
+        self.cross_scores = np.zeros((2,) + shape, dtype=np.int16)
+
+
 @total_ordering
 class Square(object):
     """Represents an individual square on the word board.
 
-       Squares hold letter tiles.
+       Squares hold letter tiles. A square is a view of its place in the
+       board arrays, a square made on its own gets arrays of its own.
     """
     key_code = {"sl": "single letter", "dl": "double letter", "tl":
                 "triple letter", "dw": "double word", "tw": "triple word",
@@ -18,19 +45,20 @@ class Square(object):
                 }
     key_value = {"sl": 1, "dl": 2, "tl": 3, "dw": 2, "tw": 3, "c": 2}
 
-    def __init__(self, x, y, tilemultiplier):
+    def __init__(self, x, y, tilemultiplier, arrays=None):
         """Represent a Square on the board, given a tile code multiplier."""
         self.x = x
         self.y = y
         self.coord = (x, y)
         self.tile_multiplier = tilemultiplier
         self.tile_multiplier_name = self.key_code[tilemultiplier]
-        self.letter_value_multiplier = None
-        self.word_value_multiplier = None
-        self.tile_letter = ""
+        if arrays is None:
+            arrays, self._at = SquareArrays(1, 1), (0, 0)
+        else:
+            self._at = (x, y)
+        self._arrays = arrays
         self.player = -1
         self.parent_word = []
-        self.free = True
         self.get_multipliers()
 
     def __hash__(self):
@@ -50,6 +78,42 @@ class Square(object):
                 self.tile_letter, self.letter_value_multiplier,
                 self.word_value_multiplier, self.free)
 
+    @property
+    def tile_letter(self):
+        """Return the letter played on the square, empty if free."""
+        code = self._arrays.letters[self._at]
+        return chr(code) if code else ""
+
+    @tile_letter.setter
+    def tile_letter(self, letter):
+        self._arrays.letters[self._at] = ord(letter) if letter else 0
+
+    @property
+    def free(self):
+        """Return True if no tile has been played on the square."""
+        return not self._arrays.occupied[self._at]
+
+    @free.setter
+    def free(self, free):
+        self._arrays.occupied[self._at] = not free
+
+    @property
+    def blank(self):
+        """Return True if the tile on the square is a blank."""
+        return bool(self._arrays.blanks[self._at])
+
+    @blank.setter
+    def blank(self, blank):
+        self._arrays.blanks[self._at] = blank
+
+    @property
+    def letter_value_multiplier(self):
+        return int(self._arrays.letter_multipliers[self._at])
+
+    @property
+    def word_value_multiplier(self):
+        return int(self._arrays.word_multipliers[self._at])
+
     @property
     def is_word_multiplier(self):
         """Return True if square is a word multiplier"""
@@ -58,11 +122,11 @@ class Square(object):
     def get_multipliers(self):
         """Return word or letter multiplier value."""
         if self.is_word_multiplier:
-            self.word_value_multiplier = self.key_value[self.tile_multiplier]
-            self.letter_value_multiplier = 1
+            self._arrays.word_multipliers[self._at] = self.key_value[
+                                                        self.tile_multiplier]
         else:
-            self.letter_value_multiplier = self.key_value[self.tile_multiplier]
-            self.word_value_multiplier = 1
+            self._arrays.letter_multipliers[self._at] = self.key_value[
+                                                        self.tile_multiplier]
 
     @property
     def is_center_square(self):
@@ -119,14 +183,82 @@ class Square(object):
         return collision_words
 
 
-class Board(object):
-    """Represents a board of tiles."""
+class BoardState(object):
+    """The board state a move search reads, held in arrays.
+
+    Holds the square arrays, the anchor index and the center square but
+    no squares or played words, so a snapshot pickles small.
+    """
+
+    def __init__(self, arrays=None, anchors=None, center=None):
+        """Represent board state from its arrays and anchor index."""
+        self.arrays = arrays
+        self._anchors = anchors if anchors is not None else ({}, {})
+        self.center = center
+
+    def anchors(self):
+        """Return the anchor squares, sorted by coord.
+
+        An empty board has the center square as its only anchor.
+        """
+        anchors = sorted([(x, y) for x, ys in self._anchors[0].items()
+                          for y in ys])
+        if not anchors and not self.arrays.occupied.any():
+            anchors = [self.center]
+        return anchors
+
+    def line_anchors(self, line, direction):
+        """Return the sorted anchor positions along line in direction.
+
+        Lines of direction 0 are fixed x, of direction 1 fixed y.
+        """
+        return sorted(self._anchors[direction].get(line, ()))
+
+    def letter(self, x, y):
+        """Return the letter at (x, y), empty if free or off the board."""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            code = self.arrays.letters[x, y]
+            return chr(code) if code else ""
+        return ""
+
+    def is_playable(self, letter, coord, direction):
+        """Return True if letter at coord forms a valid cross word."""
+        mask = self.arrays.cross_checks[(direction,) + tuple(coord)]
+        return bool(mask & LETTER_BITS.get(letter, 0))
+
+    def cross_score(self, coord, direction):
+        """Return the cross word score at coord, None if none is formed."""
+        if not self.arrays.crossed[(direction,) + tuple(coord)]:
+            return None
+        return int(self.arrays.cross_scores[(direction,) + tuple(coord)])
+
+    @property
+    def width(self):
+        """Return number of columns on board."""
+        return self.arrays.letters.shape[0]
+
+    @property
+    def height(self):
+        """Return the number of rows on the board."""
+        return self.arrays.letters.shape[1]
+
 
-    def __init__(self, layout=None):
+class Board(BoardState):
+    """Represents a board of tiles.
+
+    Free squares carry cross checks for the lexicon, cross scores are
+    valued from the tilebag when one is given. Anchor squares, the free
+    squares next to a tile, are indexed by line for each direction.
+    """
+
+    def __init__(self, layout=None, tilebag=None, lexicon=DICT):
         """Represent the whole board, given a filename to parse."""
+        super().__init__()
         self._index = {}
         self.grid = None
         self.tile_grid = None
+        self.tilebag = tilebag
+        self.lexicon = lexicon
         if layout:
             self.load_board(layout)
             self.create_board()
@@ -155,46 +287,130 @@ class Board(object):
             i += 1
 
     def load_board(self, layout):
-        """Create a playing board from a layout filenmae."""
-        self.grid = pd.read_csv(layout, header=None)
+        """Create a playing board from a layout filenmae.
+
+        The grid is a list of rows of tile codes.
+        """
+        with open(layout, newline='', encoding='utf-8-sig') as fhandle:
+            self.grid = [row for row in csv.reader(fhandle) if row]
 
     def create_board(self):
-        """Parse the layout to create a playable board."""
-        self.tile_grid = pd.DataFrame(index=self.grid.index,
-                                      columns=self.grid.columns)
+        """Parse the layout to create a playable board.
+
+        Square state is kept in board arrays, tile_grid[x][y] holds the
+        Square viewing each place.
+        """
+        columns = list(zip(*self.grid))
+        self.arrays = SquareArrays(len(columns), len(self.grid))
+        self.tile_grid = []
         counter = 0
-        for x, row in self.grid.iteritems():
-            for y, xytile in row.iteritems():
-                tile = Square(x, y, xytile)
+        for x, row in enumerate(columns):
+            squares = []
+            for y, xytile in enumerate(row):
+                tile = Square(x, y, xytile, self.arrays)
                 tile.index = counter
                 self._index[counter] = tile
-                self.tile_grid[x][y] = tile
+                squares.append(tile)
                 counter += 1
+            self.tile_grid.append(squares)
+        self.center = [sq.coord for sq in self if sq.is_center_square][0]
+
+    def snapshot(self):
+        """Return a copy of the board state, free of squares and words."""
+        return BoardState(deepcopy(self.arrays), deepcopy(self._anchors),
+                          self.center)
 
     def get_square_xy(self, word, x, y, d):
         """Return a set of squares if include wlen and direction."""
         ylim = y + len(word)
         xlim = x + len(word)
         if d == 0:
-            if self.width >= ylim:
+            if self.height >= ylim:
                 return [self.tile_grid[x][i] for i in range(y, ylim)]
             return False
-        if self.height >= xlim:
+        if self.width >= xlim:
             return [self.tile_grid[i][y] for i in range(x, xlim)]
         return False
 
     def play_word(self, word):
-        """Given a word and coordinates, position word on board."""
+        """Given a word and coordinates, position word on board.
+
+        Anchors and cross checks are updated for the squares next to the
+        placed tiles.
+        """
         word.squares = self.get_square_xy(word, word.x, word.y, word.direction)
-        for letter, square in zip(word.word, word.squares):
+        for i, (letter, square) in enumerate(zip(word.word, word.squares)):
             if square.free:
                 square.free = False
                 square.tile_letter = letter
+                square.blank = i in word.blanks
                 square.tile_used = True
             else:
                 square.reused = True
                 square.tile_used = False
             square.parent_word.append(word)
+        for square in word.squares:
+            if square.tile_used:
+                self.update_anchors(square.coord)
+                self.update_cross_checks(square.coord)
+
+    def update_anchors(self, coord):
+        """Make the free neighbours of a tile placed at coord anchors."""
+        x, y = coord
+        self._anchors[0].get(x, set()).discard(y)
+        self._anchors[1].get(y, set()).discard(x)
+        for i, j in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+            if (0 <= i < self.width and 0 <= j < self.height and
+                    not self.arrays.occupied[i, j]):
+                self._anchors[0].setdefault(i, set()).add(j)
+                self._anchors[1].setdefault(j, set()).add(i)
+
+    def update_cross_checks(self, coord):
+        """Recompute cross checks of the free squares ending lines at coord.
+
+        Only the first free square either side of the tiles in the row and
+        column through coord can have a changed cross word.
+        """
+        x, y = coord
+        for direction, (dx, dy) in ((0, (1, 0)), (1, (0, 1))):
+            for step in (-1, 1):
+                i, j = x + step * dx, y + step * dy
+                while self.letter(i, j):
+                    i, j = i + step * dx, j + step * dy
+                if 0 <= i < self.width and 0 <= j < self.height:
+                    self.set_cross_check(i, j, direction)
+
+    def set_cross_check(self, x, y, direction):
+        """Compute the cross check of free square (x, y) for direction.
+
+        A word played in direction 0 crosses the tiles above and below
+        the square, in direction 1 those left and right of it.
+        """
+        dx, dy = (1, 0) if direction == 0 else (0, 1)
+        before, after, score = "", "", 0
+        i, j = x - dx, y - dy
+        while self.letter(i, j):
+            before = self.letter(i, j) + before
+            score += self.tile_value(i, j)
+            i, j = i - dx, j - dy
+        i, j = x + dx, y + dy
+        while self.letter(i, j):
+            after += self.letter(i, j)
+            score += self.tile_value(i, j)
+            i, j = i + dx, j + dy
+        mask = ALL_LETTERS
+        if before or after:
+            mask = sum([LETTER_BITS[letter] for letter in ALPHA
+                        if before + letter + after in self.lexicon])
+        self.arrays.cross_checks[direction, x, y] = mask
+        self.arrays.crossed[direction, x, y] = bool(before or after)
+        self.arrays.cross_scores[direction, x, y] = score
+
+    def tile_value(self, x, y):
+        """Return the tilebag value of the tile at (x, y), 0 if blank."""
+        if self.tilebag is None or self.arrays.blanks[x, y]:
+            return 0
+        return self.tilebag[self.letter(x, y)].value
 
     def collides_on_side(self, square, ori):
         """Returns true if tested square collides with adjacent square ori."""
@@ -207,9 +423,9 @@ class Board(object):
             y -= 1
         if ori == "right":
             y += 1
-        if y >= self.width or y < 0:
+        if y >= self.height or y < 0:
             return False
-        if x >= self.height or x < 0:
+        if x >= self.width or x < 0:
             return False
 
         adjacent = self.tile_grid[x][y]
@@ -235,13 +451,3 @@ class Board(object):
             if check_square:
                 collisions.append((ori, check_square))
         return collisions
-
-    @property
-    def width(self):
-        """Return number of columns on board."""
-        return len(self.tile_grid.columns)
-
-    @property
-    def height(self):
-        """Return the number of rows on the board."""
-        return len(self.tile_grid.index)
@@ -1,4 +1,7 @@
-from wwfs.utils import load_dictionary
+from wwfs.lexicon import AnagramIndex, LazyLexicon
 
-DICT = load_dictionary()
+DICT = LazyLexicon()
+ANAGRAMS = LazyLexicon(AnagramIndex)
 ALPHA = list("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+LETTER_BITS = {letter: 1 << i for i, letter in enumerate(ALPHA)}
+ALL_LETTERS = (1 << len(ALPHA)) - 1
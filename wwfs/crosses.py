@@ -2,28 +2,19 @@
 from wwfs.word import WordCrosses
 
 
-def get_valid_word_crosses(word, job_data, debug=False):
-    """Compute all possible word overlaps. Mainly rack words."""
-    word_crosses = []
-    job_data.rack.racks_from_played_word(word)
-    job_data.rack.compute_rack_words(word, WordCrosses)
+def make_word_cross(candidate, coord, direction, squares, board):
+    """Return candidate as a WordCrosses if it crosses a played word.
 
-    for candidate in job_data.rack.words:
-        is_valid, bonus_words = is_valid_move(
-                                    job_data.board, word,
-                                    candidate, job_data.tilebag)
-        if is_valid:
-            tot_score = is_valid.score + sum(
-                                    [x.score for x in bonus_words])
-            word_crosses.append({"type": "crosses", "data":
-                                (word, is_valid, bonus_words,
-                                 tot_score)})
-    # print("Word Crosses for {} done. {} found.".format(
-    #                                     word, len(job_data.word_crosses)))
-    if debug:
-        return word_crosses
-    job_data.queue.put(word_crosses)
-
-
-def is_valid_move(board, word, candidate, tilebag):
-    """Check that candidate word is a legal move played on word."""
+    A placement crosses a played word when it reuses a tile of a word
+    played in the other direction. Returns None otherwise.
+    """
+    for index, square in enumerate(squares):
+        if square.free or not square.parent_word:
+            continue
+        word_cross = WordCrosses(candidate, parent=square.parent_word[0],
+                                 front=candidate[0: index] or False,
+                                 back=candidate[index + 1:] or False)
+        word_cross.direction = direction
+        word_cross.coord = coord
+        return word_cross
+    return None
@@ -1,47 +1,45 @@
 """Compute word extensions."""
-from collections import Counter
 from wwfs.word import Word, WordExtension
-from wwfs.config import DICT
 
 
-def get_valid_word_extensions(word, job_data):
-    """Wrapper to word extension computation. Makes it parallelizable."""
-    word_extensions = []
-    candidates = get_word_extensions(word, DICT, job_data.rack)
-    if candidates:
-        for candidate in candidates:
-            is_valid, bonus_words = is_valid_move(
-                                        job_data.board, word,
-                                        candidate, job_data.tilebag)
-            if is_valid:
-                tot_score = is_valid.score + sum(
-                                        [x.score for x in bonus_words])
-                word_extensions.append({"type": "extensions", "data":
-                                        (word, is_valid, bonus_words,
-                                         tot_score)})
-    # print("Word Extensions for {} done. {} found.".format(
-    #                                     word, len(word_extensions)))
-    job_data.queue.put(word_extensions)
+def make_word_extension(candidate, coord, direction, squares, board):
+    """Return candidate as a WordExtension if it extends a played word.
+
+    A placement extends a played word when it reuses the tiles of a word
+    already played in the same direction. Returns None otherwise.
+    """
+    for square in squares:
+        if square.free:
+            continue
+        for parent in square.parent_word:
+            if parent.direction != direction:
+                continue
+            offset = (parent.y - coord[1]) if direction == 0 else (
+                                                    parent.x - coord[0])
+            front = candidate[0: offset]
+            back = candidate[offset + len(parent): len(candidate)]
+            word_extension = WordExtension(candidate, parent=parent,
+                                           front=front or False,
+                                           back=back or False)
+            word_extension.direction = direction
+            if front:
+                word_extension.front_part_xy = coord
+            if back:
+                word_extension.back_part_xy = squares[
+                                            offset + len(parent)].coord
+            return word_extension
+    return None
 
 
 def get_word_extensions(word, dictionary, rack=None):
     """Return all words longer than word containing word.
     If given rack, subset for playable words (extra letters in rack).
     """
-    playable = set()
-    key_letters = Counter(word.word)
     matches = [s for s in dictionary
-               if word.word in s and len(s) > len(word)]
-    # check that letter differences exist in rack
+               if len(s) > len(word) and word.word in s]
     if rack:
-        for longerword in matches:
-            word_letters = Counter(longerword)
-            letter_diffs = word_letters - key_letters
-            if rack.has_enough_letters(letter_diffs):
-                playable.add(longerword)
-    else:
-        playable = set(matches)
-    return playable
+        matches = rack.playable(matches, word.word)
+    return set(matches)
 
 
 def get_letter_overhangs(word, candidate):
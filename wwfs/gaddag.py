@@ -0,0 +1,383 @@
+"""GADDAG lexicon and anchor driven move generation."""
+import heapq
+from collections import Counter, namedtuple
+import numpy as np
+from wwfs.config import ALPHA, LETTER_BITS
+from wwfs.crosses import make_word_cross
+from wwfs.extends import make_word_extension
+from wwfs.lexicon import Dawg
+from wwfs.runalongs import make_word_run
+from wwfs.utils import WORDLIST
+from wwfs.word import BonusWord
+
+SEPARATOR = "+"
+BLANK = "0"
+MOVE_TYPES = (("extensions", make_word_extension),
+              ("crosses", make_word_cross),
+              ("runs", make_word_run))
+
+_GADDAGS = {}
+
+
+class Move(namedtuple("Move", "score word x y direction placed bonus")):
+    """A scored placement, holding no board or word objects.
+
+    placed holds the (index, is_blank) of each rack tile put down, bonus
+    the (x, y, length) span of each cross word formed. Records order by
+    score first.
+    """
+
+    __slots__ = ()
+
+    @property
+    def coord(self):
+        return (self.x, self.y)
+
+    @property
+    def key(self):
+        return move_key(self.word, self.coord, self.direction, self.placed)
+
+
+def move_key(word, coord, direction, placed):
+    """Return the key of a placement, the same from whichever anchor.
+
+    Two placements putting the same letters on the same squares form the
+    same words, so start square, direction and letters placed identify it.
+    """
+    return (coord, direction,
+            tuple([(index, word[index], blank) for index, blank in placed]))
+
+
+def gaddag_paths(word):
+    """Return every GADDAG path of word: reversed prefix, separator, suffix.
+
+    The path for the whole word reversed has no separator, as nothing
+    follows it.
+    """
+    paths = [word[::-1]]
+    for i in range(1, len(word)):
+        paths.append(word[i - 1::-1] + SEPARATOR + word[i:])
+    return paths
+
+
+def load_gaddag(wordlist=WORDLIST):
+    """Return the GADDAG of wordlist, loading it on first use."""
+    if wordlist not in _GADDAGS:
+        _GADDAGS[wordlist] = Gaddag.from_wordlist(wordlist)
+    return _GADDAGS[wordlist]
+
+
+class Gaddag(Dawg):
+    """Minimized GADDAG of a word list.
+
+    Each word is stored once for every letter it can be grown from, so a
+    move can be built outwards from any anchor square: leftwards first,
+    then across the separator to the right.
+    """
+
+    kind = b"gaddag"
+
+    def __init__(self, words=()):
+        """Build the GADDAG from an iterable of words."""
+        super().__init__(path for word in words
+                         for path in gaddag_paths(word))
+
+class MoveGenerator(object):
+    """Find every legal placement of rack letters on a board in one pass.
+
+    Directions follow the Board convention: 0 plays along a row (y grows),
+    1 plays down a column (x grows). Positions along a line are ``pos``,
+    the fixed coordinate is ``line``.
+    """
+
+    def __init__(self, board, letters, gaddag=None):
+        """Snapshot the board letters, cross checks and prepare the rack.
+
+        board may be a Board or the BoardState of its snapshot.
+        """
+        self.board = board
+        self.gaddag = gaddag if gaddag is not None else load_gaddag()
+        self.rack = Counter(letters)
+        self.height = board.height
+        self.width = board.width
+        self.letters = {(x, y): chr(code) if code else ""
+                        for x, column in enumerate(board.arrays.letters)
+                        for y, code in enumerate(column)}
+        self.blanks = {tuple(coord) for coord
+                       in np.argwhere(board.arrays.blanks).tolist()}
+        self.masks = board.arrays.cross_checks.tolist()
+        self.letter_multipliers = board.arrays.letter_multipliers.tolist()
+        self.word_multipliers = board.arrays.word_multipliers.tolist()
+        self.crossed = board.arrays.crossed.tolist()
+        self.cross_scores = board.arrays.cross_scores.tolist()
+        self._cross_checks = {}
+
+    @staticmethod
+    def coord(line, pos, direction):
+        """Return the board (x, y) of pos along line in direction."""
+        return (line, pos) if direction == 0 else (pos, line)
+
+    def line_length(self, direction):
+        """Return the number of squares along a line in direction."""
+        return self.height if direction == 0 else self.width
+
+    def letter(self, x, y):
+        """Return the letter at (x, y), empty if free or off the board."""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.letters[(x, y)]
+        return ""
+
+    def anchors(self):
+        """Return the board anchor squares, sorted by coord."""
+        return self.board.anchors()
+
+    def cross_check(self, coord, direction):
+        """Return the letters playable at coord for a word in direction.
+
+        Returns (allowed, before, after) where before and after are the
+        letters of the perpendicular word the tile would join. allowed is
+        None when no perpendicular word is formed, else it is read from
+        the board cross checks.
+        """
+        key = (coord, direction)
+        if key not in self._cross_checks:
+            x, y = coord
+            dx, dy = (1, 0) if direction == 0 else (0, 1)
+            before = ""
+            i, j = x - dx, y - dy
+            while self.letter(i, j):
+                before = self.letter(i, j) + before
+                i, j = i - dx, j - dy
+            after = ""
+            i, j = x + dx, y + dy
+            while self.letter(i, j):
+                after += self.letter(i, j)
+                i, j = i + dx, j + dy
+            allowed = None
+            if before or after:
+                mask = self.masks[direction][x][y]
+                allowed = {letter for letter in ALPHA
+                           if mask & LETTER_BITS[letter]}
+            self._cross_checks[key] = (allowed, before, after)
+        return self._cross_checks[key]
+
+    def moves(self, anchors=None):
+        """Yield every legal placement touching anchors.
+
+        Yields (word, coord, direction, placed) where placed holds the
+        (index, is_blank) of each rack tile put down.
+        """
+        anchors = self.anchors() if anchors is None else anchors
+        for direction in (0, 1):
+            for coord in anchors:
+                line, pos = (coord if direction == 0 else coord[::-1])
+                self._line = line
+                self._direction = direction
+                self._anchor = pos
+                self._line_anchors = set(self.board.line_anchors(line,
+                                                                 direction))
+                self._found = []
+                self._gen(pos, "", [], self.gaddag.root)
+                for found in self._found:
+                    yield found
+
+    def _cell(self, pos):
+        """Return the letter at pos along the current line."""
+        return self.letter(*self.coord(self._line, pos, self._direction))
+
+    def _gen(self, pos, word, placed, node):
+        """Try every letter at pos, from the board or the rack."""
+        letter = self._cell(pos)
+        if letter:
+            self._go_on(pos, letter, word, placed,
+                        self.gaddag.child(node, letter))
+            return
+        x, y = self.coord(self._line, pos, self._direction)
+        mask = self.masks[self._direction][x][y]
+        for letter, child in self.gaddag.children(node):
+            if not mask & LETTER_BITS.get(letter, 0):
+                continue
+            for blank in (False, True):
+                tile = BLANK if blank else letter
+                if not self.rack[tile]:
+                    continue
+                self.rack[tile] -= 1
+                self._go_on(pos, letter, word, placed + [(pos, blank)],
+                            child)
+                self.rack[tile] += 1
+
+    def _go_on(self, pos, letter, word, placed, node):
+        """Extend word with letter at pos, record it if it is complete."""
+        if node is None:
+            return
+        size = self.line_length(self._direction)
+        final = self.gaddag.is_final(node)
+        if pos <= self._anchor:
+            word = letter + word
+            left_free = pos == 0 or not self._cell(pos - 1)
+            right_free = (self._anchor == size - 1 or
+                          not self._cell(self._anchor + 1))
+            if final and left_free and right_free:
+                self._record(word, pos, placed)
+            if pos > 0 and not self._is_other_anchor(pos - 1):
+                self._gen(pos - 1, word, placed, node)
+            node = self.gaddag.child(node, SEPARATOR)
+            if node is not None and left_free and self._anchor < size - 1:
+                self._gen(self._anchor + 1, word, placed, node)
+        else:
+            word = word + letter
+            if final and (pos == size - 1 or not self._cell(pos + 1)):
+                self._record(word, pos - len(word) + 1, placed)
+            if pos < size - 1:
+                self._gen(pos + 1, word, placed, node)
+
+    def _is_other_anchor(self, pos):
+        """Return True if pos is an anchor found from its own search."""
+        return pos in self._line_anchors
+
+    def _record(self, word, start, placed):
+        """Store a complete placement, skipping duplicates of the other pass.
+
+        A single tile forming words both ways is found by both directions,
+        it is kept from the across pass only.
+        """
+        if len(word) < 2 or not placed:
+            return
+        if self._direction == 1 and len(placed) == 1:
+            coord = self.coord(self._line, placed[0][0], 1)
+            if self.cross_check(coord, 1)[0] is not None:
+                return
+        placed = tuple(sorted((p - start, blank) for p, blank in placed))
+        self._found.append((word,
+                            self.coord(self._line, start, self._direction),
+                            self._direction, placed))
+
+    def score(self, word, coord, direction, placed, values):
+        """Return the score of a placement, with its cross words.
+
+        values maps each letter to its tile value. Letter values are taken
+        with the multipliers of the squares they land on, cross words at
+        their plain letter values, the board tiles they reuse read from
+        the board's cross scores. Blanks score nothing.
+        """
+        line, start = coord if direction == 0 else coord[::-1]
+        free = dict(placed)
+        letter_sum, word_multiplier, cross_sum = 0, 1, 0
+        for index, letter in enumerate(word):
+            x, y = self.coord(line, start + index, direction)
+            if index not in free:
+                if (x, y) not in self.blanks:
+                    letter_sum += values[letter]
+                continue
+            value = 0 if free[index] else values[letter]
+            letter_sum += value * self.letter_multipliers[x][y]
+            word_multiplier *= self.word_multipliers[x][y]
+            if self.crossed[direction][x][y]:
+                cross_sum += value + self.cross_scores[direction][x][y]
+        return letter_sum * word_multiplier + cross_sum
+
+    def bonus_spans(self, coord, direction, placed):
+        """Return the (x, y, length) of the cross words of placed tiles."""
+        spans = []
+        line, start = coord if direction == 0 else coord[::-1]
+        for index, _blank in placed:
+            x, y = self.coord(line, start + index, direction)
+            _allowed, before, after = self.cross_check((x, y), direction)
+            if before or after:
+                if direction == 0:
+                    x -= len(before)
+                else:
+                    y -= len(before)
+                spans.append((x, y, len(before) + len(after) + 1))
+        return tuple(spans)
+
+    def bonus_words(self, word, coord, direction, placed):
+        """Return the perpendicular words formed by the placed tiles.
+
+        Letters played or already lying as blanks are recorded as blanks.
+        """
+        bonus_words = []
+        line, start = coord if direction == 0 else coord[::-1]
+        for index, blank in placed:
+            tile_coord = self.coord(line, start + index, direction)
+            _allowed, before, after = self.cross_check(tile_coord, direction)
+            if not (before or after):
+                continue
+            x, y = tile_coord
+            if direction == 0:
+                bcoord = (x - len(before), y)
+            else:
+                bcoord = (x, y - len(before))
+            bword = BonusWord(before + word[index] + after, coord=bcoord,
+                              direction=1 - direction)
+            bword.left_part = before
+            bword.right_part = after
+            dx, dy = (1, 0) if direction == 0 else (0, 1)
+            bword.blanks = tuple([
+                i for i in range(len(bword.word))
+                if (blank and i == len(before)) or
+                (bcoord[0] + i * dx, bcoord[1] + i * dy) in self.blanks])
+            bonus_words.append(bword)
+        return bonus_words
+
+
+def find_moves(anchors, board, letters, values, k=None, seen=None):
+    """Return the k best placements through anchors. Makes it parallelizable.
+
+    board is a BoardState snapshot, letters the rack and values the tile
+    value of each letter, so a task pickles small. Placements are scored
+    exactly from the board arrays, the best kept in a bounded heap. Returns
+    their Move records best first, all of them if k is None. No score
+    bound is checked first: the exact score is one pass over the placed
+    squares and builds no words, so a bound would cost as much as the
+    score it skips.
+
+    Placements whose move_key is in seen, or found twice, are skipped
+    before they are scored. The heap orders placements by the Move fields
+    before bonus, so ties break as in the merge of every worker's moves.
+    """
+    best = []
+    seen = set() if seen is None else seen
+    generator = MoveGenerator(board, letters)
+    for word, coord, direction, placed in generator.moves(anchors):
+        key = move_key(word, coord, direction, placed)
+        if key in seen:
+            continue
+        seen.add(key)
+        move = (generator.score(word, coord, direction, placed, values),
+                word, coord[0], coord[1], direction, placed)
+        if not k or len(best) < k:
+            heapq.heappush(best, move)
+        elif move > best[0]:
+            heapq.heapreplace(best, move)
+    return [Move(score, word, x, y, direction, placed,
+                 generator.bonus_spans((x, y), direction, placed))
+            for score, word, x, y, direction, placed in
+            sorted(best, reverse=True)]
+
+
+def build_move(generator, tilebag, move):
+    """Build the typed word and bonus words of a Move on the board.
+
+    generator is a MoveGenerator of the full Board. Each move is typed by
+    how it joins the played words: extending one, crossing one or running
+    alongside one. Returns a dict of its type and
+    (parent, candidate, bonus_words, total score).
+    """
+    board = generator.board
+    word, coord, direction, placed = (move.word, move.coord, move.direction,
+                                      move.placed)
+    squares = board.get_square_xy(word, coord[0], coord[1], direction)
+    for move_type, make_word in MOVE_TYPES:
+        candidate = make_word(word, coord, direction, squares, board)
+        if candidate:
+            break
+    candidate.blanks = tuple([index for index, blank in placed if blank])
+    candidate.squares = squares
+    candidate.compute_word_score(squares, tilebag)
+    bonus_words = generator.bonus_words(word, coord, direction, placed)
+    for bword in bonus_words:
+        bword.compute_word_score(tilebag)
+    tot_score = candidate.score + sum([x.score for x in bonus_words])
+    return {"type": move_type, "data": (candidate.parent, candidate,
+                                        bonus_words, tot_score)}
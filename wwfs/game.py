@@ -73,6 +73,7 @@ class Game(object):
         self.direction = kwargs.get('direction', None)
         self.player = kwargs.get('player', None)
         self.mode = kwargs.get('mode', None)
+        self.pool = kwargs.get('pool', None)
 
         if self.mode == 'new':
             self.status = Status()
@@ -96,14 +97,12 @@ class Game(object):
         # Selects highest scoring position.
         if self.mode == 'new':
             # Best first word --> Is only a simple straight word
-            self.rack.compute_all_play_word_scores(self.board, self.tilebag)
-            self.rack.first_word(self.board)
-            word = self.rack.best_first_word
+            word = self.rack.first_word(self.board, self.tilebag)
         else:
             # TODO: Player 1 continues game. Places best word on current board.
             # Computes highest scoring move across all exisitng viable moves.
             next_move = Turn(self.rack, self.status.all_played, self.board,
-                             self.tilebag)
+                             self.tilebag, pool=self.pool)
             # Extend existing word
             # Cross existing words
             # Run along exisiting words
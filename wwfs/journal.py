@@ -0,0 +1,250 @@
+"""Append-only game journals, replayed from their latest snapshot."""
+import os
+import pickle
+import struct
+import zlib
+from wwfs.savegame import move_log, new_game, replay
+
+VERSION = 1
+MAGIC = b"WWFSJRNL"
+# magic, version, board width, board height, tiles, word size
+HEADER = struct.Struct("<8sIBBBB")
+# letter, total, value
+TILE = struct.Struct("<cBB")
+CRC = struct.Struct("<I")
+# magic, version, turn, journal header crc
+SNAPSHOT = struct.Struct("<8sIII")
+SNAPSHOT_MAGIC = b"WWFSSNAP"
+
+
+class Journal(object):
+    """A game as its layout and tiles, then one record per move played.
+
+    The header holds the board layout and tile recipe, each move is then
+    appended as a fixed size record ending in its crc32. A record cut
+    short by a crash, or failing its check, is dropped on the next write.
+    Every snapshot_every turns the whole game is pickled beside the
+    journal, so rebuilding only replays the moves since. Journals of
+    untrusted files are opened with allow_pickle False, replaying every
+    move without reading or writing snapshots.
+    """
+
+    def __init__(self, fname, snapshot_every=10, allow_pickle=True):
+        """Open the journal at fname, which is created by its first record."""
+        self.fname = fname
+        self.snapshot_every = snapshot_every if allow_pickle else 0
+        self.allow_pickle = allow_pickle
+        self._header = None
+        self._move = None
+
+    @property
+    def exists(self):
+        """Return True if the journal has been created."""
+        return os.path.exists(self.fname)
+
+    @property
+    def snapshot_fname(self):
+        return self.fname + ".snap"
+
+    def __len__(self):
+        """Return the number of whole moves in the journal."""
+        if not self.exists:
+            return 0
+        self._read_header()
+        size = os.path.getsize(self.fname) - len(self._header)
+        return max(size, 0) // self._move.size
+
+    def create(self, game):
+        """Write the header of game's layout and tiles, emptying the journal.
+
+        Records hold words as long as the longer side of the board.
+        """
+        layout = game.board.grid
+        height, width = len(layout), len(layout[0])
+        tiles = [(tile.letter, tile.total, tile.value)
+                 for tile in game.tilebag]
+        header = HEADER.pack(MAGIC, VERSION, width, height, len(tiles),
+                             max(width, height))
+        header += "".join(["{:<2}".format(code) for row in layout
+                           for code in row]).encode()
+        header += b"".join([TILE.pack(letter.encode(), total, value)
+                            for letter, total, value in tiles])
+        header += CRC.pack(zlib.crc32(header))
+        tmp_fname = self.fname + ".tmp"
+        with open(tmp_fname, 'wb') as fhandle:
+            fhandle.write(header)
+            fhandle.flush()
+            os.fsync(fhandle.fileno())
+        os.replace(tmp_fname, self.fname)
+        if os.path.exists(self.snapshot_fname):
+            os.remove(self.snapshot_fname)
+        self._header = None
+
+    def record(self, game):
+        """Append the moves of game not yet journaled.
+
+        Creates the journal for a new game, and snapshots the game when
+        its turn count reaches a multiple of snapshot_every.
+        """
+        moves = move_log(game)
+        if not self.exists:
+            self.create(game)
+        count = self.recover()
+        if count > len(moves):
+            raise ValueError("{} holds {} moves, the game {}.".format(
+                                            self.fname, count, len(moves)))
+        if count == len(moves):
+            return
+        with open(self.fname, 'ab') as fhandle:
+            for move in moves[count:]:
+                fhandle.write(self._pack(move))
+            fhandle.flush()
+            os.fsync(fhandle.fileno())
+        if self.snapshot_every and (len(moves) // self.snapshot_every >
+                                    count // self.snapshot_every):
+            self.snapshot(game)
+
+    def recover(self):
+        """Drop a partly written last record, return the whole moves left.
+
+        Only the last record is checked, so appending stays O(1).
+        """
+        count = len(self)
+        end = len(self._header) + count * self._move.size
+        if count:
+            with open(self.fname, 'rb') as fhandle:
+                fhandle.seek(end - self._move.size)
+                if not self._valid(fhandle.read(self._move.size)):
+                    count -= 1
+                    end -= self._move.size
+        if os.path.getsize(self.fname) != end:
+            with open(self.fname, 'r+b') as fhandle:
+                fhandle.truncate(end)
+        return count
+
+    def moves(self):
+        """Return the journaled moves, less a partly written last record.
+
+        Raises ValueError if a record before the last fails its check.
+        """
+        self._read_header()
+        with open(self.fname, 'rb') as fhandle:
+            fhandle.seek(len(self._header))
+            data = fhandle.read()
+        size = self._move.size
+        records = [data[i:i + size] for i in range(0, len(data), size)]
+        if records and (len(records[-1]) < size or
+                        not self._valid(records[-1])):
+            records.pop()
+        moves = []
+        for record in records:
+            if not self._valid(record):
+                raise ValueError("{} is corrupt at move {}.".format(
+                                                self.fname, len(moves) + 1))
+            moves.append(self._unpack(record))
+        return moves
+
+    def game(self, turn=None):
+        """Rebuild the game as it was after turn moves, the last if None.
+
+        The latest snapshot at or before turn is loaded and the moves
+        after it replayed, else every move is replayed.
+        """
+        moves = self.moves()
+        turn = len(moves) if turn is None else turn
+        if not 0 <= turn <= len(moves):
+            raise ValueError("{} has no turn {}.".format(self.fname, turn))
+        game, start = self._load_snapshot(turn)
+        if game is None:
+            layout, tiles = self._layout()
+            game, start = new_game(layout, tiles), 0
+        return replay(game, moves[start:turn])
+
+    def snapshot(self, game):
+        """Pickle game beside the journal, replacing the last snapshot."""
+        self._read_header()
+        tmp_fname = self.snapshot_fname + ".tmp"
+        with open(tmp_fname, 'wb') as fhandle:
+            fhandle.write(SNAPSHOT.pack(SNAPSHOT_MAGIC, VERSION,
+                                        game.status.turn_count,
+                                        zlib.crc32(self._header)))
+            pickle.dump(game, fhandle)
+        os.replace(tmp_fname, self.snapshot_fname)
+
+    def _load_snapshot(self, turn):
+        """Return the snapshot game and its turn, None if it cannot be used."""
+        if not self.allow_pickle:
+            return None, 0
+        try:
+            with open(self.snapshot_fname, 'rb') as fhandle:
+                magic, version, snap_turn, header_crc = SNAPSHOT.unpack(
+                                                fhandle.read(SNAPSHOT.size))
+                if ((magic, version, header_crc) !=
+                        (SNAPSHOT_MAGIC, VERSION, zlib.crc32(self._header))
+                        or snap_turn > turn):
+                    return None, 0
+                return pickle.load(fhandle), snap_turn
+        except (OSError, EOFError, struct.error, pickle.UnpicklingError,
+                AttributeError, ImportError):
+            return None, 0
+
+    def _read_header(self):
+        """Read and check the header, setting the move record format.
+
+        Raises ValueError if the file is not a journal of this version.
+        """
+        if self._header is not None:
+            return
+        with open(self.fname, 'rb') as fhandle:
+            data = fhandle.read(HEADER.size)
+            if len(data) < HEADER.size:
+                raise ValueError("{} is not a journal.".format(self.fname))
+            magic, version, width, height, ntiles, word_size = (
+                                                    HEADER.unpack(data))
+            if (magic, version) != (MAGIC, VERSION):
+                raise ValueError("{} is incompatible.".format(self.fname))
+            data += fhandle.read(2 * width * height + ntiles * TILE.size)
+            (crc, ) = CRC.unpack(fhandle.read(CRC.size) or bytes(CRC.size))
+        if crc != zlib.crc32(data):
+            raise ValueError("{} has a corrupt header.".format(self.fname))
+        self._header = data + CRC.pack(crc)
+        # x, y, direction, player, score, blank letters mask, word, crc32
+        self._move = struct.Struct("<BBBBhH{}sI".format(word_size))
+
+    def _layout(self):
+        """Return the layout rows and tile rows of the header."""
+        _magic, _version, width, height, ntiles, _size = HEADER.unpack_from(
+                                                                self._header)
+        offset = HEADER.size
+        codes = self._header[offset:offset + 2 * width * height].decode()
+        codes = [codes[i:i + 2].strip() for i in range(0, len(codes), 2)]
+        layout = [codes[i:i + width] for i in range(0, len(codes), width)]
+        offset += 2 * width * height
+        tiles = []
+        for _ in range(ntiles):
+            letter, total, value = TILE.unpack_from(self._header, offset)
+            tiles.append((letter.decode(), total, value))
+            offset += TILE.size
+        return layout, tiles
+
+    def _pack(self, move):
+        """Return the record of a (word, coord, direction, ...) move."""
+        word, coord, direction, player, score, blanks = move
+        record = self._move.pack(coord[0], coord[1], direction, player,
+                                 score, sum([1 << i for i in blanks]),
+                                 word.encode(), 0)
+        return record[:-CRC.size] + CRC.pack(zlib.crc32(record[:-CRC.size]))
+
+    def _unpack(self, record):
+        """Return the move of a record."""
+        (x, y, direction, player, score, mask, word,
+         _crc) = self._move.unpack(record)
+        word = word.rstrip(b"\x00").decode()
+        blanks = tuple([i for i in range(len(word)) if mask >> i & 1])
+        return (word, (x, y), direction, player, score, blanks)
+
+    def _valid(self, record):
+        """Return True if a record matches its crc32."""
+        return (len(record) == self._move.size and
+                CRC.unpack(record[-CRC.size:])[0] ==
+                zlib.crc32(record[:-CRC.size]))
@@ -0,0 +1,436 @@
+"""Directed acyclic word graphs for fast lexicon walks."""
+import mmap
+import os
+import struct
+import sys
+from array import array
+from wwfs.utils import CACHE_DIR, WORDLIST, file_hash, load_dictionary
+
+VERSION = 1
+MAGIC = b"WWFSDAWG"
+# magic, version, byte order, kind, entries, nodes, edges, source sha256
+TRAILER = struct.Struct("<8sIc8sIII32s")
+_BYTES = {chr(i): bytes([i]) for i in range(256)}
+
+
+class _Node(object):
+    """Mutable graph node used while a Dawg is being built."""
+
+    __slots__ = ('final', 'edges')
+
+    def __init__(self):
+        self.final = False
+        self.edges = {}
+
+    def key(self):
+        """Return a signature shared by all equivalent nodes."""
+        # edges are only ever added in sorted order, so no need to sort
+        return (self.final, tuple([(letter, id(child)) for letter, child
+                                   in self.edges.items()]))
+
+
+class Dawg(object):
+    """A minimized directed acyclic word graph over a set of strings.
+
+    The graph is stored packed: node ``n`` owns the edges in
+    ``offsets[n]:offsets[n + 1]``, each edge a ``labels`` byte and a
+    ``targets`` node id. Node 0 is the root.
+
+    Compiled graphs are saved in a versioned binary file, laid out as
+    labels, final flags, offsets and targets followed by a fixed size
+    trailer. Loading maps the file read-only, so every process using it
+    shares the same pages.
+    """
+
+    root = 0
+    kind = b"dawg"
+
+    def __init__(self, strings=()):
+        """Build the minimized graph from an iterable of strings."""
+        self._offsets = array('I', [0, 0])
+        self._targets = array('I')
+        self._labels = b''
+        self._final = b'\x00'
+        self._size = 0
+        self._fname = None
+        strings = sorted(set(strings))
+        if strings:
+            self._pack(self._build(strings))
+            self._size = len(strings)
+
+    def __contains__(self, string):
+        """Return True if string is a complete entry of the graph."""
+        node = self.walk(string)
+        return node is not None and self.is_final(node)
+
+    def __iter__(self):
+        """Iterate over all entries in sorted order."""
+        return self.words()
+
+    def __len__(self):
+        """Return the number of entries in the graph."""
+        return self._size
+
+    def __getstate__(self):
+        """Pickle a mapped graph by filename, workers map the same file."""
+        if self._fname:
+            return {"_fname": self._fname}
+        return self.__dict__
+
+    def __setstate__(self, state):
+        """Restore a pickled graph, mapping its file again if needed."""
+        if len(state) == 1:
+            state = self.load(state["_fname"]).__dict__
+        self.__dict__.update(state)
+
+    @classmethod
+    def cache_name(cls, source_hash, cache_dir=CACHE_DIR):
+        """Return the compiled file name for a word list hash."""
+        return os.path.join(cache_dir, "{}-{}.dawg".format(
+                            cls.kind.decode(), source_hash[:16]))
+
+    @classmethod
+    def compile(cls, wordlist=WORDLIST, cache_dir=CACHE_DIR):
+        """Build the graph from wordlist and save it, return the file name."""
+        source_hash = file_hash(wordlist)
+        fname = cls.cache_name(source_hash, cache_dir)
+        cls(load_dictionary(wordlist)).save(fname, source_hash)
+        return fname
+
+    @classmethod
+    def from_wordlist(cls, wordlist=WORDLIST, cache_dir=CACHE_DIR):
+        """Return the graph of wordlist, from its compiled file if current.
+
+        A missing or stale file is rebuilt and saved when possible.
+        """
+        source_hash = file_hash(wordlist)
+        fname = cls.cache_name(source_hash, cache_dir)
+        try:
+            return cls.load(fname, source_hash)
+        except (OSError, ValueError):
+            pass
+        dawg = cls(load_dictionary(wordlist))
+        try:
+            dawg.save(fname, source_hash)
+        except OSError:
+            pass
+        return dawg
+
+    def save(self, fname, source_hash):
+        """Write the packed graph to fname, replacing it atomically."""
+        nodes, edges = self.node_count, len(self._targets)
+        directory = os.path.dirname(fname)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_fname = "{}.{}.tmp".format(fname, os.getpid())
+        with open(tmp_fname, 'wb') as fhandle:
+            fhandle.write(self._labels)
+            fhandle.write(self._final)
+            fhandle.write(bytes(-(nodes + edges) % 4))
+            fhandle.write(array('I', self._offsets).tobytes())
+            fhandle.write(array('I', self._targets).tobytes())
+            fhandle.write(TRAILER.pack(MAGIC, VERSION,
+                                       sys.byteorder[0].encode(), self.kind,
+                                       self._size, nodes, edges,
+                                       bytes.fromhex(source_hash)))
+        os.replace(tmp_fname, fname)
+
+    @classmethod
+    def load(cls, fname, source_hash=None):
+        """Map a compiled graph read-only from fname.
+
+        Raises ValueError if the file is not a compiled graph of this kind
+        and version, or was compiled from another word list.
+        """
+        with open(fname, 'rb') as fhandle:
+            data = mmap.mmap(fhandle.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(data) < TRAILER.size:
+            raise ValueError("{} is not a compiled lexicon.".format(fname))
+        (magic, version, order, kind, size, nodes, edges,
+         digest) = TRAILER.unpack(data[-TRAILER.size:])
+        if (magic, version, order, kind.rstrip(b"\x00")) != (
+                MAGIC, VERSION, sys.byteorder[0].encode(), cls.kind):
+            raise ValueError("{} is incompatible.".format(fname))
+        if source_hash and digest != bytes.fromhex(source_hash):
+            raise ValueError("{} is out of date.".format(fname))
+        view = memoryview(data)
+        start = nodes + edges + (-(nodes + edges) % 4)
+        dawg = cls.__new__(cls)
+        dawg._labels = data
+        dawg._final = view[edges:edges + nodes]
+        dawg._offsets = view[start:start + 4 * (nodes + 1)].cast('I')
+        start += 4 * (nodes + 1)
+        dawg._targets = view[start:start + 4 * edges].cast('I')
+        dawg._size = size
+        dawg._fname = fname
+        return dawg
+
+    @staticmethod
+    def _build(strings):
+        """Build the minimal graph incrementally from sorted strings."""
+        root = _Node()
+        register = {}
+        unchecked = []  # (parent, letter, child) not yet minimized
+        previous = ""
+
+        def minimize(down_to):
+            while len(unchecked) > down_to:
+                parent, letter, child = unchecked.pop()
+                key = child.key()
+                if key in register:
+                    parent.edges[letter] = register[key]
+                else:
+                    register[key] = child
+
+        for string in strings:
+            common = 0
+            for a, b in zip(string, previous):
+                if a != b:
+                    break
+                common += 1
+            minimize(common)
+            node = unchecked[-1][2] if unchecked else root
+            for letter in string[common:]:
+                child = _Node()
+                node.edges[letter] = child
+                unchecked.append((node, letter, child))
+                node = child
+            node.final = True
+            previous = string
+        minimize(0)
+        return root
+
+    def _pack(self, root):
+        """Flatten the node graph into the packed edge arrays."""
+        ids = {id(root): 0}
+        order = [root]
+        for node in order:  # order grows as new nodes are discovered
+            for child in node.edges.values():
+                if id(child) not in ids:
+                    ids[id(child)] = len(order)
+                    order.append(child)
+        offsets = array('I', [0])
+        targets = array('I')
+        labels = bytearray()
+        for node in order:
+            for letter, child in sorted(node.edges.items()):
+                labels.append(ord(letter))
+                targets.append(ids[id(child)])
+            offsets.append(len(targets))
+        self._offsets = offsets
+        self._targets = targets
+        self._labels = bytes(labels)
+        self._final = bytes(node.final for node in order)
+
+    @property
+    def node_count(self):
+        """Return the number of nodes in the graph."""
+        return len(self._offsets) - 1
+
+    def is_final(self, node):
+        """Return True if the path to node spells a complete entry."""
+        return bool(self._final[node])
+
+    def child(self, node, letter):
+        """Return the node reached from node along letter, else None."""
+        i = self._labels.find(_BYTES[letter], self._offsets[node],
+                              self._offsets[node + 1])
+        if i < 0:
+            return None
+        return self._targets[i]
+
+    def children(self, node):
+        """Iterate over (letter, child node) pairs leaving node."""
+        for i in range(self._offsets[node], self._offsets[node + 1]):
+            yield chr(self._labels[i]), self._targets[i]
+
+    def walk(self, string, node=root):
+        """Follow string from node, return the node reached or None."""
+        find = self._labels.find
+        offsets, targets = self._offsets, self._targets
+        for letter in string:
+            i = find(_BYTES[letter], offsets[node], offsets[node + 1])
+            if i < 0:
+                return None
+            node = targets[i]
+        return node
+
+    def has_prefix(self, prefix):
+        """Return True if any entry starts with prefix."""
+        return self.walk(prefix) is not None
+
+    def words(self, prefix=""):
+        """Iterate over all entries starting with prefix, in sorted order."""
+        node = self.walk(prefix)
+        if node is None:
+            return iter(())
+        return self.completions(node, prefix)
+
+    def completions(self, node, prefix=""):
+        """Iterate over prefix plus every path from node to an entry end."""
+        labels, targets = self._labels, self._targets
+        offsets, final = self._offsets, self._final
+        stack = [(node, prefix)]
+        while stack:
+            node, string = stack.pop()
+            if final[node]:
+                yield string
+            for i in range(offsets[node + 1] - 1, offsets[node] - 1, -1):
+                stack.append((targets[i], string + chr(labels[i])))
+
+
+class Lexicon(Dawg):
+    """Dictionary of playable words, a drop-in replacement for a word set.
+
+    Supports membership tests and iteration like a set, and exposes the
+    graph so move generators can walk candidate words letter by letter.
+    """
+
+    kind = b"lexicon"
+
+    def anagrams(self, letters, min_length=2):
+        """Return all words that can be spelled from a multiset of letters."""
+        counts = {}
+        for letter in letters:
+            counts[letter] = counts.get(letter, 0) + 1
+        found = set()
+        stack = [(self.root, "")]
+        while stack:
+            node, word = stack.pop()
+            if len(word) >= min_length and self.is_final(node):
+                found.add(word)
+            for letter, child in self.children(node):
+                if word.count(letter) < counts.get(letter, 0):
+                    stack.append((child, word + letter))
+        return found
+
+
+def letter_counts(words):
+    """Return a len(words) x 26 array counting the letters A-Z of each word.
+
+    Any other character, such as the blank '0', is not counted.
+    """
+    # numpy is imported on first use, every wwfs import reaches this module
+    import numpy as np
+    words = list(words)
+    counts = np.zeros((len(words), 26), dtype=np.int16)
+    if not words:
+        return counts
+    codes = np.frombuffer("".join(words).encode("ascii", "replace"),
+                          dtype=np.uint8).astype(np.intp) - ord("A")
+    rows = np.repeat(np.arange(len(words)), [len(word) for word in words])
+    keep = (codes >= 0) & (codes < 26)
+    np.add.at(counts, (rows[keep], codes[keep]), 1)
+    return counts
+
+
+def signature(word):
+    """Return the letters of word in sorted order, shared by anagrams."""
+    return "".join(sorted(word))
+
+
+class AnagramIndex(Dawg):
+    """Index of words by signature, for finding every word in a rack.
+
+    Each word is stored as its signature, a separator and the word, so
+    anagrams share a path. Walking signatures in letter order with a
+    multiset of rack letters visits each formable signature once.
+    """
+
+    kind = b"anagram"
+    SEPARATOR = ":"
+
+    def __init__(self, words=()):
+        """Build the index from an iterable of words."""
+        super().__init__(signature(word) + self.SEPARATOR + word
+                         for word in words)
+
+    def lookup(self, letters):
+        """Return the words spelled by exactly the multiset letters."""
+        node = self.walk(signature(letters) + self.SEPARATOR)
+        if node is None:
+            return set()
+        return set(self.completions(node))
+
+    def formable(self, letters, wildcards=0, min_length=2):
+        """Return all words spelled from a sub-multiset of letters.
+
+        Up to wildcards extra letters may stand in for any letter.
+        """
+        return set(self.search(letters, wildcards, min_length))
+
+    def search(self, letters, wildcards=0, min_length=2):
+        """Return words spelled from letters, with the letters wildcards play.
+
+        Maps each word to the string of letters its wildcards stand for.
+        Rack letters are used before wildcards, so the fewest are played.
+        """
+        counts = {}
+        for letter in letters:
+            counts[letter] = counts.get(letter, 0) + 1
+        found = {}
+
+        def search(node, length, wildcards, played):
+            for letter, child in self.children(node):
+                if letter == self.SEPARATOR:
+                    if length >= min_length:
+                        found.update(dict.fromkeys(self.completions(child),
+                                                   played))
+                elif counts.get(letter):
+                    # a rack letter is never worse than a wildcard
+                    counts[letter] -= 1
+                    search(child, length + 1, wildcards, played)
+                    counts[letter] += 1
+                elif wildcards:
+                    search(child, length + 1, wildcards - 1, played + letter)
+
+        search(self.root, 0, wildcards, "")
+        return found
+
+
+class LazyLexicon(object):
+    """Stand-in for a compiled graph that loads it on first use.
+
+    Importing modules that refer to the lexicon stays cheap, and runs
+    that never look a word up never load it.
+    """
+
+    def __init__(self, graph=Lexicon, wordlist=WORDLIST, cache_dir=CACHE_DIR):
+        """Remember how to load the graph, without loading it."""
+        self._graph_class = graph
+        self._wordlist = wordlist
+        self._cache_dir = cache_dir
+        self._graph = None
+
+    def __getattr__(self, name):
+        """Delegate to the loaded graph."""
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.load(), name)
+
+    def __contains__(self, string):
+        return string in self.load()
+
+    def __iter__(self):
+        return iter(self.load())
+
+    def __len__(self):
+        return len(self.load())
+
+    def __getstate__(self):
+        """Pickle how to load the graph, not the graph itself."""
+        state = dict(self.__dict__)
+        state["_graph"] = None
+        return state
+
+    @property
+    def loaded(self):
+        """Return True if the graph has been loaded."""
+        return self._graph is not None
+
+    def load(self):
+        """Return the graph, loading it on the first call."""
+        if self._graph is None:
+            self._graph = self._graph_class.from_wordlist(self._wordlist,
+                                                          self._cache_dir)
+        return self._graph
@@ -0,0 +1,66 @@
+"""Worker pool shared by every parallel stage of a solver run."""
+import multiprocessing as mp
+import os
+from wwfs.config import DICT
+from wwfs.gaddag import load_gaddag
+
+
+def init_worker():
+    """Load the lexicon and its GADDAG once in each worker."""
+    DICT.load()
+    load_gaddag()
+
+
+class SolverPool(object):
+    """Process pool created on first use and reused until closed.
+
+    Workers run init_worker as they start, so no task has to load the
+    lexicon. Pickling keeps only the worker count, the pool is started
+    again on first use after loading.
+    """
+
+    def __init__(self, workers=None):
+        """Remember the worker count, defaults to the number of CPUs."""
+        self.workers = workers or os.cpu_count() or 1
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __getstate__(self):
+        """Pickle the worker count, not the running processes."""
+        return {"workers": self.workers, "_pool": None}
+
+    @property
+    def pool(self):
+        """Return the process pool, starting it on the first call."""
+        return self.start()._pool
+
+    def start(self):
+        """Start the workers ahead of the first task, return self."""
+        if self._pool is None:
+            load_gaddag()  # build once, before workers fork
+            self._pool = mp.Pool(self.workers, initializer=init_worker)
+        return self
+
+    def apply_async(self, func, args=()):
+        """Run func(*args) in a worker, return its AsyncResult."""
+        return self.pool.apply_async(func, args)
+
+    def imap(self, func, iterable, chunksize=1):
+        """Yield func(item) for each item of iterable, in order."""
+        return self.pool.imap(func, iterable, chunksize)
+
+    def imap_unordered(self, func, iterable, chunksize=1):
+        """Yield func(item) for each item of iterable, as workers finish."""
+        return self.pool.imap_unordered(func, iterable, chunksize)
+
+    def close(self):
+        """Stop the workers, if they were started."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
@@ -1,11 +1,23 @@
 """Compute best scoring words."""
-import itertools
-import multiprocessing as mp
 from collections import Counter
 from copy import copy
-from wwfs.utils import _chunks, permute_racks
+import numpy as np
 from wwfs.word import Word
-from wwfs.config import ALPHA, DICT
+from wwfs.config import ANAGRAMS
+from wwfs.lexicon import letter_counts
+from wwfs.scoring import first_move_scores, placement_scores
+
+
+def blank_positions(word, blank_letters):
+    """Return the indices of word played with blanks.
+
+    A blank stands for the last occurrence of its letter not yet taken.
+    """
+    positions = set()
+    for letter in blank_letters:
+        positions.add(max([i for i, x in enumerate(word)
+                           if x == letter and i not in positions]))
+    return tuple(sorted(positions))
 
 
 class Rack(object):
@@ -33,7 +45,7 @@ class Rack(object):
         self.words = set()
         if player == 1:
             # TODO: add played board letters to racks if accsesible to play
-            self.make_racks()  # solve blanks
+            self.make_racks()
             self.compute_rack_words()
 
     @property
@@ -41,19 +53,6 @@ class Rack(object):
         """Return the number of blanks in rack."""
         return len(self.letters) - len(self.letters_no_blanks)
 
-    def racks_from_blanks(self):
-        """Add racks from solving blanks."""
-        if self.nblanks == 2:
-            d = set()
-            for i in itertools.product(ALPHA, repeat=2):
-                d.add("".join(sorted(list(i))))
-            for d in sorted(list(d)):
-                self.racks.append(Counter(list(d) + self.letters_no_blanks))
-            return
-
-        for A in ALPHA:
-            self.racks.append(Counter([A, ] + self.letters_no_blanks))
-
     def racks_from_played_word(self, word):
         """Extend racks from played word."""
         self.original_letters = [] + self.letters
@@ -65,74 +64,95 @@ class Rack(object):
             check.add(letter)
             self.letters = [letter] + self.original_letters
             self.letters_no_blanks = [x for x in self.letters if x != '0']
-            self.make_racks()  # solve blanks
+            self.make_racks()
 
     def make_racks(self, include_played=False):
-        """Compute all playable racks by solving blanks."""
-        # 1. Generate racks from blanks
-        if self.nblanks:
-            self.racks_from_blanks()
+        """Add the current letters as a playable rack.
 
-        # 2. Add in rack from nonblanks
-        if not self.nblanks:
-            self.racks.append(Counter(self.letters_no_blanks))
+        Blanks stay in the rack as '0', searches treat them as wildcards.
+        """
+        self.racks.append(Counter(self.letters))
 
     def compute_rack_words(self, xword=None, WordType=Word):
-        """Permute rack letters to generate list of viable words."""
-        rack_strings = set(["".join(sorted(list(r.elements())))
-                            for r in self.racks])
-        words = set()
-        with mp.Pool(2) as pool:
-            for rack_string in _chunks(list(rack_strings), 2):
-                result = pool.apply(permute_racks, (rack_string, DICT, ))
-                words.update(result)
-        pool.close()
-        pool.join()
-
-        if xword:
-            self.words = {WordType(x, parent=xword) for x in words if
-                          set(xword.word) & set(x)}
-        else:
-            self.words = {WordType(x) for x in words}
-
-    def compute_all_play_word_scores(self, board, tilebag):
-        """Return the highest scoring word play for all rack words."""
-        xword_scores = set()
-        for word in self.words:
-            for i, square in enumerate(board):
-                for d in (0, 1):
-                    squares = board.get_square_xy(word, square.x, square.y, d)
-                    if squares:
-                        xword = copy(word)
-                        xword.compute_word_score(squares, tilebag)
-                        xword.coord = square.coord
-                        xword.direction = d
-                        xword_scores.add(xword)
-        self.word_scores = list(xword_scores)
-        self.word_scores.sort(key=lambda x: (-x.score, x.word, x.x, x.y,
-                                             x.direction))
-
-    def first_word(self, board):
-        """Return best word that passes through center square."""
-        center = [i.coord for i in board if i.is_center_square][0]
-        for word in self.word_scores:
-            if word.coord == center:
-                break
+        """Look up every word spelled from rack letters in the anagram index.
+
+        Blanks are searched as wildcards. Each word records the positions
+        its blanks are played at, using as few blanks as possible.
+        """
+        words = {}
+        for rack in self.racks:
+            letters = [x for x in rack.elements() if x != '0']
+            for word, blank_letters in ANAGRAMS.search(
+                                            letters, rack['0']).items():
+                if word not in words or len(blank_letters) < len(
+                                                            words[word]):
+                    words[word] = blank_letters
+
+        self.words = set()
+        for x, blank_letters in words.items():
+            if xword and not set(xword.word) & set(x):
+                continue
+            word = WordType(x, parent=xword) if xword else WordType(x)
+            word.blanks = blank_positions(x, blank_letters)
+            self.words.add(word)
+
+    def compute_all_play_word_scores(self, board, tilebag, k=None):
+        """Rank every board placement of all rack words by score.
+
+        word_scores is a structured array of word, x, y, direction and
+        score, highest score first. Given k, only the top k are kept.
+        """
+        self.word_scores = placement_scores(self.words, board, tilebag, k)
+
+    def first_word(self, board, tilebag, k=1):
+        """Return best word covering the center square, for a new game.
+
+        The top k placements through the center are kept in first_moves.
+        """
+        self.first_moves = first_move_scores(self.words, board, tilebag, k)
+        words = {x.word: x for x in self.words}
+        placement = self.first_moves[0]
+        word = copy(words[placement["word"]])
+        word.coord = (int(placement["x"]), int(placement["y"]))
+        word.direction = int(placement["direction"])
+        word.score = int(placement["score"])
         self.best_first_word = word
+        return word
 
     def has_enough_letters(self, ldiffs):
-        """Return True if a rack has enough letters to play word."""
-        for rack in self.racks:
-            totdiff = sum(ldiffs.values())
-            for l, c in ldiffs.items():
-                if l in rack:
-                    count = rack[l]
-                    totdiff -= count
-                    if count - c < 0:  # not enough letters, short circuit
-                        break
-            if totdiff < 1:
-                return True
-        return False
+        """Return True if a rack has enough letters to play word.
+
+        Blanks make up for any letters the rack is short of.
+        """
+        return bool(self.feasible(letter_counts(
+                                    [''.join(ldiffs.elements())]))[0])
+
+    def rack_counts(self):
+        """Return the letter counts and number of blanks of each rack."""
+        counts = letter_counts([''.join(rack.elements())
+                                for rack in self.racks])
+        blanks = np.array([rack['0'] for rack in self.racks], dtype=np.int16)
+        return counts, blanks
+
+    def feasible(self, needed):
+        """Return which rows of letter counts needed any rack can supply.
+
+        needed is an N x 26 array, such as from letter_counts, of the
+        letters each candidate takes from the rack. A candidate is
+        feasible when the letters a rack is short of number no more than
+        its blanks.
+        """
+        needed = np.atleast_2d(needed)
+        counts, blanks = self.rack_counts()
+        missing = np.clip(needed[:, np.newaxis, :] - counts, 0, None).sum(
+                                                                    axis=2)
+        return (missing <= blanks).any(axis=1)
+
+    def playable(self, words, board_letters=""):
+        """Return the words spelled from the rack plus board_letters."""
+        words = list(words)
+        needed = letter_counts(words) - letter_counts([board_letters])
+        return [word for word, ok in zip(words, self.feasible(needed)) if ok]
 
     @property
     def opponent_word(self):
@@ -1,32 +1,23 @@
 """Compute word runalongs."""
-from wwfs.config import DICT
+from wwfs.word import WordRuns
 
 
-def get_valid_word_runs(word, job_data):
-    """Compute all possible word run along."""
-    word_runs = []
-    candidates = get_word_runs(word, DICT, job_data.rack)
-    if candidates:
-        for candidate in candidates:
-            is_valid, bonus_words = is_valid_move(
-                                        job_data.board, word,
-                                        candidate, job_data.tilebag)
-            if is_valid:
-                tot_score = is_valid.score + sum(
-                                        [x.score for x in bonus_words])
-                word_runs.append({"type": "runs", "data":
-                                 (word, is_valid, bonus_words,
-                                  tot_score)})
-    # print("Word Runalongs for {} done. {} found.".format(
-    #                                     word, len(job_data.word_runs)))
-    job_data.queue.put(word_runs)
+def make_word_run(candidate, coord, direction, squares, board):
+    """Return candidate as a WordRuns, a word played alongside others.
 
-
-def get_word_runs(word, DICT, rack):
-    """Get all valid words that run along existing board words."""
-    pass
-
-
-def is_valid_move(board, word, candidate, tilebag):
-    """Check that candidate word is a legal move played on board."""
-    pass
+    Run alongs reuse no played tiles, they join the board through the
+    bonus words their tiles make. The parent is the played word beside the
+    first touching tile, preferring one that runs the same way.
+    """
+    parents = []
+    for square in squares:
+        for ori in ('up', 'down', 'left', 'right'):
+            neighbour = board.collides_on_side(square, ori)
+            if neighbour:
+                parents += neighbour.parent_word
+    same_way = [x for x in parents if x.direction == direction]
+    parent = (same_way or parents or [None])[0]
+    word_run = WordRuns(candidate, parent=parent)
+    word_run.direction = direction
+    word_run.coord = coord
+    return word_run
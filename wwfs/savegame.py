@@ -0,0 +1,174 @@
+"""Save games as a compact versioned record of the board and moves."""
+import os
+import struct
+import numpy as np
+from wwfs.board import Board
+from wwfs.game import Game, Status
+from wwfs.tiles import TileBag
+from wwfs.word import Word
+
+VERSION = 1
+MAGIC = b"WWFSGAME"
+# magic, version, board width, board height, tiles, moves
+HEADER = struct.Struct("<8sIBBBH")
+# letter, total, value, played
+TILE = struct.Struct("<cBBB")
+# x, y, direction, player, score, blank letters mask, word length
+MOVE = struct.Struct("<BBBBhHB")
+
+
+class GameRecord(object):
+    """A game as its board layout, letter grid, tile counts and move log.
+
+    The layout holds the two letter tile code of each square and letters
+    the tile played on it, lower case if played with a blank, both by
+    rows as in the board file. tiles holds (letter, total, value, played)
+    and moves (word, coord, direction, player, score, blanks) in play
+    order. Records are read without building the board, game rebuilds it
+    by replaying the moves.
+    """
+
+    def __init__(self, layout, letters, tiles, moves):
+        """Hold the rows of codes and letters, tiles and the move log."""
+        self.layout = layout
+        self.letters = letters
+        self.tiles = tiles
+        self.moves = moves
+
+    @classmethod
+    def from_game(cls, game):
+        """Return the record of a game."""
+        arrays = game.board.arrays
+        grid = np.where(arrays.blanks, arrays.letters + 32, arrays.letters)
+        letters = ["".join([chr(code) if code else "." for code in row])
+                   for row in grid.T]
+        tiles = [(tile.letter, tile.total, tile.value, tile.played)
+                 for tile in game.tilebag]
+        return cls(game.board.grid, letters, tiles, move_log(game))
+
+    def write(self, fname):
+        """Write the record to fname, replacing it only once complete."""
+        height, width = len(self.layout), len(self.layout[0])
+        tmp_fname = fname + ".tmp"
+        with open(tmp_fname, 'wb') as fhandle:
+            fhandle.write(HEADER.pack(MAGIC, VERSION, width, height,
+                                      len(self.tiles), len(self.moves)))
+            for row in self.layout:
+                fhandle.write("".join(["{:<2}".format(code)
+                                       for code in row]).encode())
+            for row in self.letters:
+                fhandle.write(row.encode())
+            for letter, total, value, played in self.tiles:
+                fhandle.write(TILE.pack(letter.encode(), total, value,
+                                        played))
+            for word, coord, direction, player, score, blanks in self.moves:
+                mask = sum([1 << i for i in blanks])
+                fhandle.write(MOVE.pack(coord[0], coord[1], direction,
+                                        player, score, mask, len(word)))
+                fhandle.write(word.encode())
+            fhandle.flush()
+            os.fsync(fhandle.fileno())
+        os.replace(tmp_fname, fname)
+
+    @classmethod
+    def read(cls, fname):
+        """Read a record from fname.
+
+        Raises ValueError if the file is not a saved game of this version.
+        """
+        with open(fname, 'rb') as fhandle:
+            data = fhandle.read()
+        if len(data) < HEADER.size:
+            raise ValueError("{} is not a saved game.".format(fname))
+        magic, version, width, height, ntiles, nmoves = HEADER.unpack_from(
+                                                                        data)
+        if (magic, version) != (MAGIC, VERSION):
+            raise ValueError("{} is incompatible.".format(fname))
+        try:
+            offset = HEADER.size
+            layout = []
+            for _ in range(height):
+                row = data[offset:offset + 2 * width].decode()
+                layout.append([row[i:i + 2].strip()
+                               for i in range(0, 2 * width, 2)])
+                offset += 2 * width
+            letters = []
+            for _ in range(height):
+                letters.append(data[offset:offset + width].decode())
+                offset += width
+            tiles = []
+            for _ in range(ntiles):
+                letter, total, value, played = TILE.unpack_from(data, offset)
+                tiles.append((letter.decode(), total, value, played))
+                offset += TILE.size
+            moves = []
+            for _ in range(nmoves):
+                (x, y, direction, player, score, mask,
+                 length) = MOVE.unpack_from(data, offset)
+                offset += MOVE.size
+                word = data[offset:offset + length].decode()
+                offset += length
+                blanks = tuple([i for i in range(length) if mask >> i & 1])
+                moves.append((word, (x, y), direction, player, score,
+                              blanks))
+        except (struct.error, UnicodeDecodeError):
+            raise ValueError("{} is truncated.".format(fname))
+        if offset != len(data):
+            raise ValueError("{} has trailing data.".format(fname))
+        return cls(layout, letters, tiles, moves)
+
+    def game(self):
+        """Rebuild the game by replaying the moves on the layout.
+
+        Raises ValueError if the replayed board or tile counts differ from
+        the record.
+        """
+        game = new_game(self.layout, [(letter, total, value) for
+                                      letter, total, value, _played
+                                      in self.tiles])
+        replay(game, self.moves)
+        replayed = GameRecord.from_game(game)
+        if (replayed.letters, replayed.tiles) != (self.letters, self.tiles):
+            raise ValueError("Replayed moves do not match the saved board.")
+        return game
+
+
+def new_game(layout, tiles):
+    """Return a game on an empty board of layout, tiles all in the bag.
+
+    layout holds rows of tile codes, tiles (letter, total, value) rows.
+    """
+    tilebag = TileBag()
+    tilebag.set_tiles(tiles)
+    board = Board(tilebag=tilebag)
+    board.grid = layout
+    board.create_board()
+    return Game(board=board, tilebag=tilebag, status=Status(),
+                mode="continue")
+
+
+def replay(game, moves):
+    """Play moves of (word, coord, direction, player, score, blanks)."""
+    for word, coord, direction, player, score, blanks in moves:
+        move = Word(word, coord=coord, direction=direction, player=player,
+                    score=score)
+        move.blanks = blanks
+        move.played = True
+        game.board.play_word(move)
+        game.status.update(move)
+        game.tilebag.update(move)
+        game.player = player
+    return game
+
+
+def move_log(game):
+    """Return the (word, coord, direction, player, score, blanks) played."""
+    return [(word.word, word.squares[0].coord, word.direction, word.player,
+             word.score, tuple(word.blanks))
+            for word in game.status.all_played]
+
+
+def is_record(fname):
+    """Return True if fname starts like a saved game record."""
+    with open(fname, 'rb') as fhandle:
+        return fhandle.read(len(MAGIC)) == MAGIC
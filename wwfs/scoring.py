@@ -0,0 +1,138 @@
+"""Score every placement of words on a board at once."""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+PLACEMENT = [("word", object), ("x", np.int16), ("y", np.int16),
+             ("direction", np.int8), ("score", np.int32)]
+
+
+def letter_values(words, tilebag):
+    """Return a len(words) x length array of letter values.
+
+    All words must be the same length. Letters played with a blank are
+    valued 0.
+    """
+    values = np.array([[tilebag[letter].value for letter in word.word]
+                       for word in words], dtype=np.int32)
+    for i, word in enumerate(words):
+        values[i, list(word.blanks)] = 0
+    return values
+
+
+def multiplier_windows(board, length, direction):
+    """Return the letter and word multipliers of every placement of length.
+
+    Both are arrays indexed [x, y, i] by the start square of a placement
+    and the index of its letter. Played squares carry no multiplier.
+    """
+    arrays = board.arrays
+    letter_multipliers = np.where(arrays.occupied, 1,
+                                  arrays.letter_multipliers)
+    word_multipliers = np.where(arrays.occupied, 1, arrays.word_multipliers)
+    axis = 1 if direction == 0 else 0
+    return (sliding_window_view(letter_multipliers, length, axis=axis),
+            sliding_window_view(word_multipliers, length, axis=axis))
+
+
+def placement_scores(words, board, tilebag, k=None):
+    """Return every placement of words on board, ranked by score.
+
+    Words of a length are scored together: letter values are summed with
+    the letter multipliers of each window of squares, then multiplied by
+    the product of the window's word multipliers. Returns a structured
+    array of word, x, y, direction and score, ranked by score then word,
+    coord and direction. Only the top k are ranked if k is given.
+    """
+    by_length = {}
+    for word in words:
+        by_length.setdefault(len(word), []).append(word)
+    placements = []
+    for length, group in by_length.items():
+        values = letter_values(group, tilebag)
+        strings = np.array([word.word for word in group], dtype=object)
+        for direction in (0, 1):
+            if length > board.arrays.letters.shape[1 - direction]:
+                continue
+            letter_windows, word_windows = multiplier_windows(
+                                                board, length, direction)
+            scores = (np.einsum("nl,xyl->nxy", values, letter_windows) *
+                      word_windows.prod(axis=2))
+            n, x, y = np.indices(scores.shape)
+            placed = np.empty(scores.size, dtype=PLACEMENT)
+            placed["word"] = strings[n.ravel()]
+            placed["x"] = x.ravel()
+            placed["y"] = y.ravel()
+            placed["direction"] = direction
+            placed["score"] = scores.ravel()
+            placements.append(placed)
+    return rank(placements, k)
+
+
+def is_diagonal_symmetric(board):
+    """Return True if the board multipliers mirror about the diagonal."""
+    arrays = board.arrays
+    return (arrays.letter_multipliers.shape[0] ==
+            arrays.letter_multipliers.shape[1] and
+            (arrays.letter_multipliers == arrays.letter_multipliers.T).all()
+            and (arrays.word_multipliers == arrays.word_multipliers.T).all())
+
+
+def first_move_scores(words, board, tilebag, k=None):
+    """Return the top k placements covering the center square, ranked.
+
+    Only the windows of the center row and column that hold the center
+    square are scored. On a board that mirrors about its diagonal a down
+    placement scores as its across mirror, so only across is scored.
+    """
+    center = board.center
+    directions = (0,) if is_diagonal_symmetric(board) else (0, 1)
+    by_length = {}
+    for word in words:
+        by_length.setdefault(len(word), []).append(word)
+    placements = []
+    for length, group in by_length.items():
+        values = letter_values(group, tilebag)
+        strings = np.array([word.word for word in group], dtype=object)
+        for direction in directions:
+            line, pos = center if direction == 0 else center[::-1]
+            size = board.arrays.letters.shape[1 - direction]
+            starts = np.arange(max(0, pos - length + 1),
+                               min(pos, size - length) + 1)
+            if not len(starts):
+                continue
+            letter_windows, word_windows = multiplier_windows(
+                                                board, length, direction)
+            if direction == 0:
+                letter_windows = letter_windows[line, starts]
+                word_windows = word_windows[line, starts]
+            else:
+                letter_windows = letter_windows[starts, line]
+                word_windows = word_windows[starts, line]
+            scores = values.dot(letter_windows.T) * word_windows.prod(axis=1)
+            n, i = np.indices(scores.shape)
+            placed = np.empty(scores.size, dtype=PLACEMENT)
+            placed["word"] = strings[n.ravel()]
+            placed["x"] = line if direction == 0 else starts[i.ravel()]
+            placed["y"] = starts[i.ravel()] if direction == 0 else line
+            placed["direction"] = direction
+            placed["score"] = scores.ravel()
+            placements.append(placed)
+    return rank(placements, k)
+
+
+def rank(placements, k=None):
+    """Join lists of placements, ranked by score then word and position.
+
+    Given k, placements scoring below the k-th best are dropped before
+    the sort and only the top k are returned.
+    """
+    if not placements:
+        return np.empty(0, dtype=PLACEMENT)
+    placements = np.concatenate(placements)
+    if k is not None and k < len(placements):
+        kth = np.partition(placements["score"], -k)[-k]
+        placements = placements[placements["score"] >= kth]
+    order = np.lexsort((placements["direction"], placements["y"],
+                        placements["x"], placements["word"].astype(str),
+                        -placements["score"]))
+    return placements[order][:k]
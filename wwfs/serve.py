@@ -0,0 +1,284 @@
+"""Serve turns from a process that keeps the lexicon and workers loaded."""
+import json
+import os
+import socket
+import socketserver
+import stat
+from argparse import Namespace
+from http.client import HTTPConnection
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from wwfs.utils import CACHE_DIR, turn_summary
+
+# a socket only its owner can connect to, where Unix sockets exist
+if hasattr(socket, "AF_UNIX"):
+    DEFAULT_ADDRESS = os.path.join(CACHE_DIR, "wwfs.sock")
+else:
+    DEFAULT_ADDRESS = "127.0.0.1:8642"
+# Host headers of requests, browser pages posting from elsewhere are refused
+LOCAL_HOSTS = ("localhost", "127.0.0.1", "[::1]")
+# turn arguments sent by the client, filenames are resolved client side
+TURN_ARGS = ("player1", "player2", "coord", "direction", "save", "load",
+             "board", "tilebag", "rack", "game", "journal")
+TURN_FILES = ("save", "load", "board", "tilebag", "journal")
+SOLVE_FILES = ("board", "tilebag")
+
+
+def parse_address(address):
+    """Return the (host, port) of a host:port address, or a socket path.
+
+    An address holding a path separator, or naming no port, is the path
+    of a Unix socket.
+    """
+    host, _sep, port = address.rpartition(":")
+    if os.sep in address or not port.isdigit():
+        return address
+    return (host or "127.0.0.1", int(port))
+
+
+def play_turn(server, request):
+    """Play a turn with the server's pool, return the turn output.
+
+    A turn naming a game plays the game held by the server's sessions,
+    starting it if it is new, else the game of the load and save files.
+    Turns of a game, or of a save file, are played one at a time. Files
+    must be under the server's root, and are never unpickled.
+    """
+    # the solver is imported by the server only, not by --connect clients
+    from wwfs.wwfs import game_message, play
+    request = server.resolve_files(request, TURN_FILES)
+    args = Namespace(**dict([(key, request.get(key)) for key in TURN_ARGS]))
+    if args.game:
+        args.save = args.journal = None
+        with server.sessions.locked(args.game):
+            last_turn = server.sessions.get(args.game)
+            args.load = args.game if last_turn is not None else ""
+            message = game_message(args)
+            game, next_play = play(args, server.pool, last_turn,
+                                   allow_pickle=False)
+            server.sessions.put(args.game, game)
+    else:
+        args.save = args.save or os.path.join(server.root,
+                                              "wwfs_game_data.pkl")
+        args.load = args.load or ""
+        message = game_message(args)
+        with server.sessions.locked(args.journal or args.save):
+            game, next_play = play(args, server.pool, allow_pickle=False)
+    return {"message": message, "board": str(game.board),
+            "status": game.print_status(),
+            "summary": turn_summary(game, next_play)}
+
+
+def solve(server, request):
+    """Solve a position, in the batch format, on a worker."""
+    from wwfs.batch import solve_position
+    request = server.resolve_files(request, SOLVE_FILES)
+    return json.loads(server.pool.apply_async(
+                        solve_position,
+                        (json.dumps(request), server.board,
+                         server.tilebag, request.get("k", 1))).get())
+
+
+ROUTES = {"/play": play_turn, "/solve": solve}
+
+
+class SolverHandler(BaseHTTPRequestHandler):
+    """Answer JSON requests posted to the ROUTES paths.
+
+    Requests must name a local Host, and posts carry a JSON body, so a
+    web page cannot send the server a form or a rebound host name.
+    """
+
+    def do_GET(self):
+        """Report the server is up, with its worker count."""
+        if self.check_host():
+            self.reply(200, {"workers": self.server.pool.workers})
+
+    def do_POST(self):
+        """Run the route of the path on the JSON request body."""
+        if not self.check_host():
+            return
+        if self.headers.get_content_type() != "application/json":
+            return self.reply(415, {"error": "Requests must be "
+                                             "application/json."})
+        route = ROUTES.get(self.path)
+        if route is None:
+            return self.reply(404, {"error": "No route: {}".format(
+                                                                self.path)})
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+            reply = route(self.server, request)
+        except Exception as err:  # a bad turn must not stop the server
+            return self.reply(400, {"error": "{}: {}".format(
+                                                type(err).__name__, err)})
+        self.reply(200, reply)
+
+    def check_host(self):
+        """Return True if the Host header names this server, else refuse."""
+        if self.headers.get("Host", "") in self.server.hosts:
+            return True
+        self.reply(403, {"error": "Unexpected Host: {}".format(
+                                                self.headers.get("Host"))})
+        return False
+
+    def reply(self, code, body):
+        """Send body as a JSON response."""
+        data = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        """Requests are not logged."""
+
+
+class SolverMixIn(object):
+    """Solver state shared by the request handlers of a server."""
+
+    daemon_threads = True
+
+    def init_solver(self, pool, board=None, tilebag=None, sessions=None,
+                    root=None):
+        """Solve with pool, holding games in sessions.
+
+        board and tilebag are the default filenames of solved positions.
+        Files named by requests must be under root, the current directory
+        if None.
+        """
+        from wwfs.session import SessionStore
+        self.pool = pool
+        self.board = board
+        self.tilebag = tilebag
+        self.sessions = SessionStore() if sessions is None else sessions
+        self.root = os.path.realpath(root or os.getcwd())
+        self.hosts = set(LOCAL_HOSTS)
+        if isinstance(self.server_address, tuple):
+            self.hosts.update(["{}:{}".format(host, self.server_address[1])
+                               for host in LOCAL_HOSTS])
+
+    def resolve_files(self, request, keys):
+        """Return request with its filenames named by keys made absolute.
+
+        Relative names are taken from root. Raises PermissionError for a
+        file outside root.
+        """
+        request = dict(request)
+        for key in keys:
+            fname = request.get(key)
+            if not fname:
+                continue
+            path = os.path.realpath(os.path.join(self.root, fname))
+            if os.path.commonpath([self.root, path]) != self.root:
+                raise PermissionError("{} is outside {}.".format(fname,
+                                                                 self.root))
+            request[key] = path
+        return request
+
+
+class SolverServer(SolverMixIn, ThreadingHTTPServer):
+    """HTTP server on a localhost port, holding the solver pool."""
+
+    def __init__(self, address, pool, board=None, tilebag=None,
+                 sessions=None, root=None):
+        """Serve on address, solving with pool."""
+        ThreadingHTTPServer.__init__(self, address, SolverHandler)
+        self.init_solver(pool, board, tilebag, sessions, root)
+
+
+if hasattr(socketserver, "UnixStreamServer"):
+    class UnixSolverServer(SolverMixIn, socketserver.ThreadingMixIn,
+                           socketserver.UnixStreamServer):
+        """SolverServer on a Unix socket, readable by its owner only."""
+
+        def __init__(self, path, pool, board=None, tilebag=None,
+                     sessions=None, root=None):
+            """Serve on the socket at path, solving with pool.
+
+            A socket left at path by an earlier server is replaced, any
+            other file raises FileExistsError.
+            """
+            if os.path.lexists(path):
+                if not stat.S_ISSOCK(os.lstat(path).st_mode):
+                    raise FileExistsError("{} is not a socket.".format(path))
+                os.remove(path)
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            socketserver.UnixStreamServer.__init__(self, path, SolverHandler)
+            self.init_solver(pool, board, tilebag, sessions, root)
+
+        def server_bind(self):
+            """Bind the socket with mode 0600, so no other user connects."""
+            umask = os.umask(0o177)
+            try:
+                socketserver.UnixStreamServer.server_bind(self)
+            finally:
+                os.umask(umask)
+
+        def get_request(self):
+            """Give the handler a (host, port) like client address."""
+            request, _address = self.socket.accept()
+            return request, ("local", 0)
+
+        def server_close(self):
+            """Close and remove the socket file."""
+            socketserver.UnixStreamServer.server_close(self)
+            if os.path.exists(self.server_address):
+                os.remove(self.server_address)
+
+
+def make_server(address, pool, board=None, tilebag=None, sessions=None,
+                root=None):
+    """Return the server for a host:port address or Unix socket path."""
+    address = parse_address(address)
+    if isinstance(address, tuple):
+        return SolverServer(address, pool, board, tilebag, sessions, root)
+    return UnixSolverServer(address, pool, board, tilebag, sessions, root)
+
+
+class UnixHTTPConnection(HTTPConnection):
+    """HTTP connection over a Unix socket."""
+
+    def __init__(self, path, timeout=None):
+        super().__init__("localhost", timeout=timeout)
+        self.path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.path)
+
+
+def request(address, path, body, timeout=None):
+    """Post body to a wwfs server, return its JSON reply.
+
+    Raises RuntimeError with the server's error if the request failed.
+    """
+    address = parse_address(address)
+    if isinstance(address, tuple):
+        connection = HTTPConnection(*address, timeout=timeout)
+    else:
+        connection = UnixHTTPConnection(address, timeout=timeout)
+    try:
+        connection.request("POST", path, json.dumps(body),
+                           {"Content-Type": "application/json"})
+        response = connection.getresponse()
+        reply = json.loads(response.read())
+    finally:
+        connection.close()
+    if response.status != 200:
+        raise RuntimeError(reply.get("error"))
+    return reply
+
+
+def turn_request(args):
+    """Return the JSON request of a turn's command line arguments.
+
+    Filenames are made absolute, the server may run elsewhere.
+    """
+    body = dict([(key, getattr(args, key, None)) for key in TURN_ARGS])
+    if body["game"]:
+        body["save"] = body["load"] = body["journal"] = None
+    for key in TURN_FILES:
+        if body[key]:
+            body[key] = os.path.abspath(body[key])
+    return body
@@ -0,0 +1,118 @@
+"""Hold games in memory between turns, journaling each turn to disk."""
+import os
+import re
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+import wwfs.utils as utils
+from wwfs.journal import Journal
+
+GAMES_DIR = os.path.join(utils.CACHE_DIR, "games")
+GAME_ID = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+
+class SessionStore(object):
+    """Games keyed by id, the max_games most recently played in memory.
+
+    Each turn is appended to the game's journal in directory. Games past
+    the budget are dropped from memory, least recently played first, and
+    replayed from their journal on their next turn. Each id has a lock, so
+    turns of one game run in order while other games play in parallel;
+    it is kept only while turns hold or wait for it.
+    """
+
+    def __init__(self, directory=GAMES_DIR, max_games=1000,
+                 snapshot_every=10):
+        """Keep up to max_games in memory, journaling them to directory."""
+        self.directory = directory
+        self.max_games = max_games
+        self.snapshot_every = snapshot_every
+        self._games = OrderedDict()
+        # game id: (lock, turns holding or waiting for it)
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, game_id):
+        return game_id in self._games or os.path.exists(self.path(game_id))
+
+    def __len__(self):
+        return len(self._games)
+
+    def path(self, game_id):
+        """Return the filename of a game's journal.
+
+        Raises ValueError for ids that are not a plain file name.
+        """
+        if not GAME_ID.match(game_id) or game_id.strip(".") == "":
+            raise ValueError("Invalid game id: {!r}".format(game_id))
+        return os.path.join(self.directory, game_id + ".journal")
+
+    def journal(self, game_id):
+        """Return the journal of a game id."""
+        return Journal(self.path(game_id), self.snapshot_every)
+
+    @contextmanager
+    def locked(self, game_id):
+        """Hold the lock of a game id for the turn.
+
+        The lock is dropped once no turn holds or waits for it, so only
+        the ids in play keep one.
+        """
+        with self._lock:
+            lock, users = self._locks.get(game_id, (None, 0))
+            lock = lock or threading.Lock()
+            self._locks[game_id] = (lock, users + 1)
+        try:
+            with lock:
+                yield
+        finally:
+            with self._lock:
+                lock, users = self._locks[game_id]
+                if users == 1:
+                    del self._locks[game_id]
+                else:
+                    self._locks[game_id] = (lock, users - 1)
+
+    def get(self, game_id):
+        """Return the game of id, from memory or disk, None if unknown.
+
+        Call holding the game's lock, as for put.
+        """
+        with self._lock:
+            if game_id in self._games:
+                self._games.move_to_end(game_id)
+                return self._games[game_id]
+        journal = self.journal(game_id)
+        if not journal.exists:
+            return None
+        game = journal.game()
+        self._hold(game_id, game)
+        return game
+
+    def put(self, game_id, game):
+        """Journal the turns of game and hold it as the most recent."""
+        os.makedirs(self.directory, exist_ok=True)
+        self.journal(game_id).record(game)
+        self._hold(game_id, game)
+
+    def _hold(self, game_id, game):
+        """Hold game in memory, dropping the least recent past the budget.
+
+        Games with a lock are kept, a turn of theirs is in play or waiting.
+        """
+        with self._lock:
+            self._games[game_id] = game
+            self._games.move_to_end(game_id)
+            for old_id in list(self._games):
+                if len(self._games) <= self.max_games:
+                    break
+                if old_id not in self._locks:
+                    del self._games[old_id]
+
+    def flush(self):
+        """Snapshot every game held in memory, for a quicker replay."""
+        with self._lock:
+            games = list(self._games.items())
+        for game_id, game in games:
+            with self.locked(game_id):
+                self.journal(game_id).snapshot(game)
@@ -1,5 +1,5 @@
 """Represent tiles in WWFs and the tile bag."""
-import pandas as pd
+import csv
 
 TILES = list("ABCDEFGHIJKLMNOPQRSTUVWXYZ0")
 
@@ -29,9 +29,10 @@ class Tile(object):
 class TileBag(object):
     """A collection of all the letter tiles available for play."""
 
-    def __init__(self, fname):
+    def __init__(self, fname=None):
         """Load the Tile Bag of letters at the start of a game."""
-        self.tile_bag = self.initialise_bag(fname)
+        self.bag = {}
+        self.tile_bag = self.initialise_bag(fname) if fname else None
         self.played = []
 
     def __str__(self):
@@ -49,23 +50,27 @@ class TileBag(object):
 
     def initialise_bag(self, fname):
         """Parse the tile bag recipe, and return the playable letters."""
-        bag = {}
-        _bag = pd.read_csv(fname)
+        with open(fname, newline='', encoding='utf-8-sig') as fhandle:
+            _bag = [row for row in csv.reader(fhandle) if row][1:]
+        self.set_tiles(_bag)
 
-        for _x, row in _bag.iterrows():
+    def set_tiles(self, rows):
+        """Fill the bag from rows of letter, total and value."""
+        bag = {}
+        for row in rows:
             letter, total, value = row
             letter = "0" if letter == "Space" else letter
             bag[letter] = Tile(letter, int(total), int(value))
 
         self.bag = bag
 
-    def tiles_in_word(self, word):
-        """Return tiles that make up word."""
-        return [self[x] for x in word]
+    def tiles_in_word(self, word, blanks=()):
+        """Return tiles that make up word, blank tiles at blanks."""
+        return [self["0" if i in blanks else x] for i, x in enumerate(word)]
 
     def update(self, word):
         """Remove played letter tiles from bag."""
-        used = self.tiles_in_word(word.word)
+        used = self.tiles_in_word(word.word, word.blanks)
         squares = word.squares
 
         for tile, square in zip(used, squares):
@@ -73,6 +78,11 @@ class TileBag(object):
                 self.played.append(tile.letter)
                 tile.played += 1
 
+    @property
+    def values(self):
+        """Return the value of each letter tile."""
+        return {tile.letter: tile.value for tile in self}
+
     @property
     def remaining(self):
         """Report the total number of tiles remaining in the bag."""
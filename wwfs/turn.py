@@ -1,9 +1,10 @@
 """Computes the best next move."""
 
-import multiprocessing as mp
-from wwfs.extends import get_valid_word_extensions
-from wwfs.crosses import get_valid_word_crosses
-from wwfs.runalongs import get_valid_word_runs
+import heapq
+from functools import partial
+from wwfs.gaddag import MoveGenerator, build_move, find_moves
+from wwfs.pool import SolverPool
+from wwfs.utils import _chunks
 
 
 class TurnData(object):
@@ -13,20 +14,23 @@ class TurnData(object):
         self.rack = kwargs.get("rack", None)
         self.board = kwargs.get('board', None)
         self.tilebag = kwargs.get('tilebag', None)
-
-
-def do_task(xfunc, word, turn_data):
-    """Wrapper function to multiprocessing."""
-    return xfunc(word, turn_data)
+        self.k = kwargs.get('k', None)
 
 
 class Turn(object):
     """Calculate best legal word move in game."""
 
-    def __init__(self, rack, played_words, board, tilebag, debug=False):
-        """Construct the board for analysis."""
-        self.turn_data = TurnData(rack=rack, board=board, tilebag=tilebag)
+    def __init__(self, rack, played_words, board, tilebag, debug=False, k=5,
+                 pool=None):
+        """Construct the board for analysis.
+
+        Only the k best moves are searched for, None searches them all.
+        Work runs on pool, a SolverPool, or on one started for this turn.
+        """
+        self.turn_data = TurnData(rack=rack, board=board, tilebag=tilebag,
+                                  k=k)
         self.played_words = played_words
+        self.pool = pool
         self.anchor_word = None
         self.turn_word = None
         self.turn_bonus_words = None
@@ -41,8 +45,8 @@ class Turn(object):
 
     def __str__(self):
         return ("Play: {} at: {}:{} scores: {}. Bonus words: {}\n"
-                "Considered: {} words out of Extensions: {}, Crosses: {}, Ru"
-                "ns: {}.").format(
+                "Considered: {} moves, played Extensions: {}, Crosses: {}, "
+                "Runs: {}.").format(
                 self.turn_word.word, self.turn_word.coord,
                 self.turn_word.direction, self.turn_score,
                 " ".join([x.word for x in self.turn_bonus_words]),
@@ -51,35 +55,69 @@ class Turn(object):
                 )
 
     def compute_move(self):
-        """Parallel process next move."""
-        processes = []
-        mp_manager = mp.Manager()
-        self.turn_data.queue = mp_manager.Queue(len(self.played_words) * 3)
-        with mp.Pool(4) as pool:
-            for word in self.played_words:
-                for task in [get_valid_word_extensions,
-                             get_valid_word_crosses, get_valid_word_runs]:
-                    processes.append(pool.apply_async(do_task,
-                                     (task, word, self.turn_data, )))
-            for xproc in processes:
-                xproc.get()
-            pool.close()
-            pool.join()
-            result_types = {"extensions": self.extensions,
-                            "crosses": self.crosses, "runs": self.runs}
-            while not self.turn_data.queue.empty():
-                results = self.turn_data.queue.get()
-                if results:
-                    for result in results:
-                        result_type = result_types[result["type"]]
-                        result_type.append(result['data'])
-
-        self.playable = self.extensions + self.crosses + self.runs
-        self.playable.sort(key=lambda x: x[3], reverse=True)
+        """Parallel process next move.
+
+        Anchor squares, the free squares next to played tiles, are shared
+        out between the workers. Each worker generates every placement
+        through its anchors in a single GADDAG pass, and returns its k
+        best; playable holds the k best overall.
+
+        Tasks carry a snapshot of the board arrays, the rack letters and
+        the tile values. Workers map the lexicon from its compiled file
+        and return their Move records, merged into the ranking as they
+        arrive. playable holds the records, best first. Without a shared
+        pool, one is started for the turn and closed after it.
+        """
+        if self.pool is None:
+            with SolverPool() as pool:
+                return self.solve(pool)
+        return self.solve(self.pool)
+
+    def solve(self, pool):
+        """Rank the moves found by the workers of pool into playable."""
+        anchors = self.turn_data.board.anchors()
+        jobs = [x for x in _chunks(anchors, pool.workers) if x]
+        snapshot = self.turn_data.board.snapshot()
+        letters = "".join(sorted(self.turn_data.rack.letters))
+        values = self.turn_data.tilebag.values
+        task = partial(find_moves, board=snapshot, letters=letters,
+                       values=values, k=self.turn_data.k)
+        moves = []
+        seen = set()
+        for results in pool.imap_unordered(task, jobs):
+            for move in results:
+                self.rank_move(moves, move, seen)
+        self.playable = sorted(moves, reverse=True)
+
+    def rank_move(self, moves, move, seen=None):
+        """Add move to the moves heap, keeping the k best.
+
+        Move records order by score, ties are broken by the rest of the
+        record so rankings repeat. A move whose key is in seen, found
+        from another worker's anchors, is dropped.
+        """
+        if seen is not None:
+            if move.key in seen:
+                return
+            seen.add(move.key)
+        if not self.turn_data.k or len(moves) < self.turn_data.k:
+            heapq.heappush(moves, move)
+        elif move > moves[0]:
+            heapq.heapreplace(moves, move)
 
     def best_word(self):
-        """Compute_best move."""
-        self.anchor_word = self.playable[0][0]
-        self.turn_word = self.playable[0][1]
-        self.turn_bonus_words = self.playable[0][2]
-        self.turn_score = self.playable[0][3]
+        """Compute_best move.
+
+        Words are only built, on the full board, for the move played, and
+        only once: later calls return the word built first.
+        """
+        if self.turn_word is not None:
+            return self.turn_word
+        generator = MoveGenerator(self.turn_data.board, "")
+        result = build_move(generator, self.turn_data.tilebag,
+                            self.playable[0])
+        {"extensions": self.extensions, "crosses": self.crosses,
+         "runs": self.runs}[result["type"]].append(result["data"])
+        (self.anchor_word, self.turn_word, self.turn_bonus_words,
+         self.turn_score) = result["data"]
+        return self.turn_word
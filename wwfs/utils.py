@@ -1,21 +1,40 @@
 """A collection of useful Utility functions."""
-import itertools
+import hashlib
+import os
 import pickle
 
-WORDLIST = "/usr/share/dict/words"
+# both may be set in the environment, read by every run and compile-lexicon
+WORDLIST = os.environ.get("WWFS_WORDLIST", "/usr/share/dict/words")
+CACHE_DIR = os.environ.get("WWFS_CACHE_DIR", os.path.join(
+                os.environ.get("XDG_CACHE_HOME",
+                               os.path.expanduser("~/.cache")), "wwfs"))
 
 
 def load_dictionary(wordlist=WORDLIST):
-    """Return a list of known words parsed from WORDLIST."""
+    """Return a list of known words parsed from WORDLIST.
+
+    Words with letters that have no tile (accents, digits) are skipped.
+    """
     words = set()
     with open(wordlist) as fhandle:
         for word in fhandle:
             if "'" in word or len(word) < 2:
                 continue
-            words.add(word.strip().upper())
+            word = word.strip().upper()
+            if word.isascii() and word.isalpha():
+                words.add(word)
     return words
 
 
+def file_hash(fname):
+    """Return the sha256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(fname, 'rb') as fhandle:
+        for block in iter(lambda: fhandle.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
 def _chunks(seq, num):
     avg = len(seq) / float(num)
     out = []
@@ -26,31 +45,29 @@ def _chunks(seq, num):
     return out
 
 
-def permute_racks(racks, DICT):
-    result = set()
-    for rack in racks:
-        maxlen = len(rack) + 1
-        for wl in range(2, maxlen):
-            for yword in itertools.permutations(rack, r=wl):
-                yword = "".join(yword)
-                if yword in DICT:
-                    result.add(yword)
-    return result
-
-
 def is_valid_word(word, wordlist):
     """Check word is valid in the dictionary."""
     return True if word in wordlist else False
 
 
 def save(fname, game_data):
-    """Save game data at end of turn."""
-    with open(fname, 'wb') as f:
-        pickle.dump(game_data, f)
-
-
-def load(fname):
-    """Load game data at start of turn."""
+    """Save game data at end of turn, as a compact game record."""
+    # imported here, the game modules import this one
+    from wwfs.savegame import GameRecord
+    GameRecord.from_game(game_data).write(fname)
+
+
+def load(fname, allow_pickle=True):
+    """Load game data at start of turn.
+
+    Game records are replayed, older saves are unpickled unless
+    allow_pickle is False, when they raise ValueError.
+    """
+    from wwfs.savegame import GameRecord, is_record
+    if is_record(fname):
+        return GameRecord.read(fname).game()
+    if not allow_pickle:
+        raise ValueError("{} is not a saved game record.".format(fname))
     with open(fname, 'rb') as f:
         game_data = pickle.load(f)
         return game_data
@@ -58,16 +75,22 @@ def load(fname):
 
 def dump_output(game, next_play):
     """Wrap up turn by displaying status to screen."""
-    print("Tiles remaining: {}\nNext play: {}.\n".format(
+    print(turn_summary(game, next_play))
+
+
+def turn_summary(game, next_play):
+    """Return the end of turn status: tiles left and the scores."""
+    msg = "Tiles remaining: {}\nNext play: {}.\n\n".format(
                                                     game.tilebag.remaining,
-                                                    next_play))
+                                                    next_play)
     p1, p2 = game.status.player1total, game.status.player2total
     nturns = game.status.turn_count
 
     if game.tilebag.remaining < 1:
         outcome = game.status.report_winner()
-        print("Game over. Player1: {}, Opponent: {}. Outcome: {}".format(
-                                                            p1, p2, outcome))
+        msg += "Game over. Player1: {}, Opponent: {}. Outcome: {}".format(
+                                                            p1, p2, outcome)
     else:
-        print("Player1: {}, Opponent: {}, Turns: {}".format(
-                                                            p1, p2, nturns))
+        msg += "Player1: {}, Opponent: {}, Turns: {}".format(
+                                                            p1, p2, nturns)
+    return msg
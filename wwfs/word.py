@@ -7,6 +7,8 @@ from functools import total_ordering
 class BaseWord(ABC):
     """Represent a played word."""
 
+    blanks = ()  # indices of letters played with a blank tile
+
     def __init__(self, word, **kwargs):
         """Establish a played word instance."""
         self._kwargs = kwargs
@@ -42,7 +44,9 @@ class BaseWord(ABC):
         pair = zip(letter_values, squares)
         letter_scores = []
         word_multipliers = []
-        for letter_value, square in pair:
+        for i, (letter_value, square) in enumerate(pair):
+            if i in self.blanks or getattr(square, "blank", False):
+                letter_value = 0
             if square.free:
                 letter_scores.append(
                                 letter_value * square.letter_value_multiplier)
@@ -141,6 +145,21 @@ class WordCrosses(BaseWord):
         super().compute_word_score(squares, tilebag)
 
 
+class WordRuns(BaseWord):
+    """Represent a word run along an existing word."""
+
+    def __init__(self, word, **kwargs):
+        self.word = word
+        self.parent = kwargs.get("parent", None)
+        self.direction = None
+        self.coord = (None, None)
+        self.score = None
+
+    def compute_word_score(self, squares, tilebag):
+        """Given a word run along, compute turn score."""
+        super().compute_word_score(squares, tilebag)
+
+
 class BonusWord(BaseWord):
     """Represent an additional word created by playing another."""
 
@@ -148,8 +167,9 @@ class BonusWord(BaseWord):
         super().__init__(word, **kwargs)
 
     def compute_word_score(self, tilebag):
-        """Bonus words only count letter scores."""
-        self.score = sum([tilebag[letter].value for letter in self.word])
+        """Bonus words only count letter scores, blanks score nothing."""
+        self.score = sum([tilebag[letter].value for i, letter
+                          in enumerate(self.word) if i not in self.blanks])
 
 
 class PlayedWords(object):
@@ -1,12 +1,18 @@
 """wwfs main routine."""
+import os
+import sys
 import wwfs.utils as utils
+from wwfs.config import ANAGRAMS, DICT
 from wwfs.board import Board
+from wwfs.gaddag import Gaddag, load_gaddag
+from wwfs.lexicon import AnagramIndex, Lexicon
+from wwfs.pool import SolverPool
 from wwfs.rack import Rack
 from wwfs.tiles import TileBag
 from wwfs.game import Game
 
 
-def main(args):
+def main(args, pool=None):
     """ Main execution function for wwfs application.
 
     Parse command line arguments, instantiate Game object with parameters.
@@ -18,6 +24,7 @@ def main(args):
     ---------
     load : filename of saved game. Empty strings signifies new game.
     save : filename to save game state after turn. Default wwfs_game_data.pkl
+    journal : filename of a game journal, used in place of load and save.
     board : filename of comma separated values board design.
     tilebag : filename of comman separated values tile letter bag.
     rack : character string of up to 7 letter tiles for play.
@@ -25,11 +32,33 @@ def main(args):
     player2 : signifies its opponent's turn.
     coord : coordinates on board first letter (row, column) for player2 turn.
     direction : specify player2 turn 0=horiztonal play, 1=vertical play.
+    workers : number of worker processes. Defaults to the number of CPUs.
+
+    A running pool may be given, else one is started for the turn.
 
     Returns
     -------
     wwfs_game_data.pkl in invoked directory.
     """
+    xgame = game_message(args)
+    print(xgame)
+
+    if pool is None:
+        with SolverPool(getattr(args, "workers", None)) as pool:
+            game, next_play = play(args, pool)
+    else:
+        game, next_play = play(args, pool)
+
+    # Output results, and exit saving game state.
+    print(game.print_board())
+    print(game.print_status())
+    utils.dump_output(game, next_play)
+
+    return xgame
+
+
+def game_message(args):
+    """Return the message naming who plays and whether the game is new."""
     # Test for debug execution
     if hasattr(args, '_debug'):
         xgame = "DEBUG: "
@@ -37,25 +66,43 @@ def main(args):
         args._debug = False
         xgame = ""
     # Build the playing board for a new game - new if no supplied load filename
-    if not args.load and args.player1:
+    journal = getattr(args, "journal", None)
+    load = args.load or (journal and os.path.exists(journal))
+    if not load and args.player1:
         xgame += "Player 1 starts a new game."
-    if not args.load and args.player2:
+    if not load and args.player2:
         xgame += "Player 2 starts a new game."
         raise NotImplementedError("Player2 starts new game is unsupported.")
-    if args.load and args.player1:
+    if load and args.player1:
         xgame += "Player 1 continues a game."
-    if args.load and args.player2:
+    if load and args.player2:
         xgame += "Player 2 continues a game."
+    return xgame
 
-    print(xgame)
 
-    if not args.load:
-        board = Board(args.board)
+def play(args, pool, last_turn=None, allow_pickle=True):
+    """Play the turn given by args, and save the game state.
+
+    The game is given as last_turn, or loaded from the load filename, and
+    saved to the save filename if there is one. Given a journal filename,
+    the game is replayed from it and the turn appended to it instead.
+    With allow_pickle False, pickled saves and snapshots are not loaded.
+    Returns the game and who plays next.
+    """
+    journal = None
+    if getattr(args, "journal", None):
+        from wwfs.journal import Journal
+        journal = Journal(args.journal, allow_pickle=allow_pickle)
+        if last_turn is None and journal.exists:
+            last_turn = journal.game()
+    elif last_turn is None and args.load:
+        last_turn = utils.load(args.load, allow_pickle)
+    if last_turn is None:
         tilebag = TileBag(args.tilebag)
+        board = Board(args.board, tilebag)
         status = None
         mode = "new"
     else:
-        last_turn = utils.load(args.load)
         board = last_turn.board
         tilebag = last_turn.tilebag
         status = last_turn.status
@@ -77,14 +124,119 @@ def main(args):
 
     # Game is the main app object, invoke take_turn to play.
     game = Game(board=board, tilebag=tilebag, status=status, rack=rack,
-                coord=coord, direction=direction, mode=mode, player=player)
+                coord=coord, direction=direction, mode=mode,
+                player=player, pool=pool)
     if not args._debug:
         game.take_turn()
+    if journal is not None:
+        journal.record(game)
+    elif args.save:
+        utils.save(args.save, game)
+    return game, next_play
 
-    # Output results, and exit saving game state.
-    print(game.print_board())
-    print(game.print_status())
-    utils.save(args.save, game)
-    utils.dump_output(game, next_play)
 
-    return xgame
+def compile_lexicon(args):
+    """Compile the word list into the binary lexicon files.
+
+    Writes the lexicon, its GADDAG and anagram index to the cache
+    directory, named by a hash of the word list so later runs map them
+    instead of rebuilding.
+
+    Arguments
+    ---------
+    wordlist : filename of the word list, one word per line.
+    cache_dir : directory of compiled lexicon files.
+
+    Returns
+    -------
+    list of compiled filenames.
+    """
+    compiled = []
+    for graph in (Lexicon, Gaddag, AnagramIndex):
+        fname = graph.compile(args.wordlist, args.cache_dir)
+        print("Compiled {}: {}".format(graph.kind.decode(), fname))
+        compiled.append(fname)
+    return compiled
+
+
+def batch(args):
+    """Solve a stream of positions, one JSON object per line.
+
+    Positions are solved across one worker pool, which loads the lexicon
+    once per worker. Each result line holds the position id and its best
+    moves, or the error that stopped it being solved.
+
+    Arguments
+    ---------
+    positions : filename of JSON lines positions, - reads standard input.
+    output : filename of JSON lines results, - writes standard output.
+    board : filename of the default board design.
+    tilebag : filename of the default tile letter bag.
+    k : number of best moves returned per position.
+    unordered : write results as they finish, not in input order.
+    chunksize : positions sent to a worker at a time.
+    workers : number of worker processes. Defaults to the number of CPUs.
+
+    Returns
+    -------
+    number of positions solved.
+    """
+    from wwfs.batch import solve_positions
+    source = sys.stdin if args.positions == "-" else open(args.positions)
+    sink = sys.stdout if args.output == "-" else open(args.output, "w")
+    count = 0
+    try:
+        with SolverPool(args.workers) as pool:
+            for result in solve_positions(source, pool, args.board,
+                                          args.tilebag, args.k,
+                                          not args.unordered, args.chunksize):
+                sink.write(result + "\n")
+                count += 1
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+    return count
+
+
+def serve(args):
+    """Serve turns and solves until interrupted.
+
+    The lexicon, its anagram index, the GADDAG and the worker pool are
+    loaded once, then each request only pays for its solve. Turns are
+    posted to /play as the command line arguments, positions to /solve as
+    batch positions. Turns naming a game id keep the game in memory
+    between turns. The files requests name must be under root.
+
+    Arguments
+    ---------
+    address : host:port on localhost, or the path of a Unix socket.
+              Defaults to serve.DEFAULT_ADDRESS, a socket only the user
+              can connect to.
+    sessions : directory games are evicted to. Defaults to session.GAMES_DIR.
+    max_games : number of games held in memory between turns.
+    board : filename of the default board design of solved positions.
+    tilebag : filename of the default tile letter bag of solved positions.
+    workers : number of worker processes. Defaults to the number of CPUs.
+    root : directory of the files turns and positions may name. Defaults
+           to the current directory.
+    """
+    from wwfs.serve import DEFAULT_ADDRESS, make_server
+    from wwfs.session import GAMES_DIR, SessionStore
+    address = args.address or DEFAULT_ADDRESS
+    for lexicon in (DICT, ANAGRAMS):
+        lexicon.load()
+    load_gaddag()
+    with SolverPool(args.workers).start() as pool:
+        sessions = SessionStore(args.sessions or GAMES_DIR, args.max_games)
+        server = make_server(address, pool, args.board, args.tilebag,
+                             sessions, args.root)
+        print("Serving on {}".format(address))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            sessions.flush()